@@ -5,20 +5,15 @@ This package provides browser automation capabilities with AI-powered decision m
 using Anthropic's Claude models.
 """
 
-from .anthropic_client import anthropic_client
-from .browser_agent import AgentState, is_destructive_action, run_agent_workflow
-from .browser_manager import (
-    click_element,
-    close_browser_context,
-    create_browser_context,
-    get_interactive_elements,
-    health_check,
-    navigate_to_url,
-    scroll_page,
-    type_text,
-)
-from .config import settings
-from .decision_engine import decision_engine
+import importlib
+import importlib._bootstrap
+import importlib.machinery
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import Any
+
 from .exceptions import (
     AgentError,
     AnthropicAPIError,
@@ -32,14 +27,65 @@ from .exceptions import (
     ValidationError,
 )
 from .logging_config import log
-from .security import security_manager
-from .tools import get_browser_tools
 
-__version__ = "1.0.0"
+_EAGER = frozenset(
+    {
+        "log",
+        "BrowserFreakError",
+        "ConfigurationError",
+        "BrowserError",
+        "BrowserTimeoutError",
+        "ElementNotFoundError",
+        "AgentError",
+        "SecurityError",
+        "APIError",
+        "AnthropicAPIError",
+        "ValidationError",
+    }
+)
+
+# Heavy symbols (Playwright, Anthropic, LangGraph) and the settings, which read the .env,
+# are resolved on first access
+_LAZY = {
+    "settings": ("browserfreak.config", "settings"),
+    "anthropic_client": ("browserfreak.anthropic_client", "anthropic_client"),
+    "AgentState": ("browserfreak.browser_agent", "AgentState"),
+    "is_destructive_action": ("browserfreak.browser_agent", "is_destructive_action"),
+    "run_agent_workflow": ("browserfreak.browser_agent", "run_agent_workflow"),
+    "stream_agent_workflow": ("browserfreak.browser_agent", "stream_agent_workflow"),
+    "click_element": ("browserfreak.browser_manager", "click_element"),
+    "close_browser_context": ("browserfreak.browser_manager", "close_browser_context"),
+    "create_browser_context": ("browserfreak.browser_manager", "create_browser_context"),
+    "get_interactive_elements": ("browserfreak.browser_manager", "get_interactive_elements"),
+    "health_check": ("browserfreak.browser_manager", "health_check"),
+    "navigate_to_url": ("browserfreak.browser_manager", "navigate_to_url"),
+    "scroll_page": ("browserfreak.browser_manager", "scroll_page"),
+    "BrowserContextPool": ("browserfreak.browser_manager", "BrowserContextPool"),
+    "BrowserSession": ("browserfreak.browser_manager", "BrowserSession"),
+    "get_browser_pool": ("browserfreak.browser_manager", "get_browser_pool"),
+    "shutdown_browser_pool": ("browserfreak.browser_manager", "shutdown_browser_pool"),
+    "warm_browser_pool": ("browserfreak.browser_manager", "warm_browser_pool"),
+    "type_text": ("browserfreak.browser_manager", "type_text"),
+    "decision_engine": ("browserfreak.decision_engine", "decision_engine"),
+    "batch_decide": ("browserfreak.decision_engine", "batch_decide"),
+    "security_manager": ("browserfreak.security", "security_manager"),
+    "skill_cache": ("browserfreak.skill_cache", "skill_cache"),
+    "get_browser_tools": ("browserfreak.tools", "get_browser_tools"),
+    "get_browser_tools_json": ("browserfreak.tools", "get_browser_tools_json"),
+}
+
+try:
+    from ._version import __version__
+except ImportError:  # pragma: no cover - source tree without _version.py
+    from importlib.metadata import version as _dist_version
+
+    __version__ = _dist_version("browserfreak")
+
 __author__ = "BrowserFreak Team"
-__all__ = [
+__all__ = (
     # Core functionality
     "run_agent_workflow",
+    "stream_agent_workflow",
     "is_destructive_action",
     "AgentState",
     # Configuration and logging
@@ -65,9 +111,88 @@ __all__ = [
     "scroll_page",
     "get_interactive_elements",
     "health_check",
+    "BrowserContextPool",
+    "BrowserSession",
+    "get_browser_pool",
+    "shutdown_browser_pool",
+    "warm_browser_pool",
     # Advanced components
     "anthropic_client",
     "decision_engine",
+    "batch_decide",
     "security_manager",
+    "skill_cache",
     "get_browser_tools",
-]
+    "get_browser_tools_json",
+)
+
+
+def _load_submodule(module_name: str) -> ModuleType:
+    """Load a package submodule straight from its source file, bypassing the meta path finders"""
+    # Take the import system's own per-module lock, so concurrent lazy lookups and plain
+    # imports of the same submodule wait for a single load instead of racing
+    with importlib._bootstrap._ModuleLockManager(module_name):  # type: ignore[attr-defined]
+        module = sys.modules.get(module_name)
+        if module is not None:
+            return module
+        return _exec_submodule(module_name)
+
+
+def _exec_submodule(module_name: str) -> ModuleType:
+    """Load a submodule not yet in sys.modules; the caller holds its module lock"""
+    # Zip or frozen installs have no source file next to __file__
+    if __spec__ is None or not isinstance(__spec__.loader, importlib.machinery.SourceFileLoader):
+        return importlib.import_module(module_name)
+
+    short_name = module_name.rpartition(".")[2]
+    path = os.path.join(os.path.dirname(__file__), f"{short_name}.py")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        return importlib.import_module(module_name)
+
+    module = importlib.util.module_from_spec(spec)
+    # Marked as initializing, plain imports from other threads wait on the module lock
+    # rather than taking the half-executed module from sys.modules
+    spec._initializing = True  # type: ignore[attr-defined]
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    finally:
+        spec._initializing = False  # type: ignore[attr-defined]
+
+    setattr(sys.modules[__name__], short_name, module)
+    return module
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve heavy package attributes on first access (PEP 562)"""
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(_load_submodule(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return list(__all__)
+
+
+class _LazyPackage(ModuleType):
+    """Keep submodule imports from shadowing lazily exported instances of the same name"""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if isinstance(value, ModuleType) and _LAZY.get(name, ("",))[0] == value.__name__:
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
+
+if __debug__ and os.environ.get("BROWSERFREAK_SELFCHECK"):
+    assert set(__all__) == set(_LAZY) | _EAGER, "__all__ is out of sync with _LAZY/_EAGER"
@@ -0,0 +1,7 @@
+"""
+Package version for BrowserFreak
+
+Read statically by the build backend (see [tool.setuptools.dynamic] in pyproject.toml).
+"""
+
+__version__ = "1.0.0"
@@ -3,29 +3,56 @@ Streamlit UI for BrowserFreak - AI-powered browser automation
 """
 
 import asyncio
-import base64
+import atexit
 import concurrent.futures
 import json
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 import streamlit as st
 
 try:
     # Try relative imports first (for development)
-    from .browser_agent import run_agent_workflow
-    from .browser_manager import health_check
+    from .browser_agent import stream_agent_workflow
+    from .browser_manager import health_check, shutdown_browser_pool, warm_browser_pool
     from .config import settings
     from .exceptions import BrowserFreakError
     from .logging_config import log
 except ImportError:
     # Fall back to absolute imports (for installed package)
-    from browserfreak.browser_agent import run_agent_workflow
-    from browserfreak.browser_manager import health_check
+    from browserfreak.browser_agent import stream_agent_workflow
+    from browserfreak.browser_manager import (
+        health_check,
+        shutdown_browser_pool,
+        warm_browser_pool,
+    )
     from browserfreak.config import settings
     from browserfreak.exceptions import BrowserFreakError
     from browserfreak.logging_config import log
 
+try:
+    # uvloop is optional and unavailable on Windows
+    import uvloop
+
+    _new_event_loop: Callable[[], asyncio.AbstractEventLoop] = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
 # Set page configuration
 st.set_page_config(
     page_title=settings.ui.page_title,
@@ -45,6 +72,61 @@ st.set_page_config(
 )
 
 
+T = TypeVar("T")
+
+
+@st.cache_resource
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Shared worker threads for blocking calls made by UI coroutines"""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="bf-bg")
+
+
+@st.cache_resource
+def _get_bg_loop() -> asyncio.AbstractEventLoop:
+    """Start the event loop that runs agent and health coroutines for this process"""
+    loop = _new_event_loop()
+    # run_in_executor(None, ...) offloads reuse the shared pool
+    loop.set_default_executor(_get_executor())
+    thread = threading.Thread(target=loop.run_forever, name="browserfreak-loop", daemon=True)
+    thread.start()
+    atexit.register(_shutdown_bg_loop, loop, thread)
+    return loop
+
+
+def _shutdown_bg_loop(loop: asyncio.AbstractEventLoop, thread: threading.Thread) -> None:
+    """Give the background loop the cleanup asyncio.run() performs before exit"""
+
+    async def shutdown() -> None:
+        # Cancel whatever is still running, then release browsers and async generators
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await shutdown_browser_pool()
+        await loop.shutdown_asyncgens()
+
+    try:
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=10)
+    except Exception as e:
+        log.warning(f"Background loop shutdown failed: {e}")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
+
+
+def run_in_background(coro: Coroutine[Any, Any, T], timeout: float) -> T:
+    """Run a coroutine on the background loop and wait for its result"""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_bg_loop())
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
 # Initialize session state
 def initialize_session_state():
     """Initialize all necessary session state variables"""
@@ -72,6 +154,22 @@ def initialize_session_state():
     if "task_complete" not in st.session_state:
         st.session_state.task_complete = False
 
+    # Background agent run, polled by the progress fragment
+    if "agent_future" not in st.session_state:
+        st.session_state.agent_future = None
+
+    if "agent_entries" not in st.session_state:
+        st.session_state.agent_entries = None
+
+    if "agent_deadline" not in st.session_state:
+        st.session_state.agent_deadline = 0.0
+
+    if "agent_approval" not in st.session_state:
+        st.session_state.agent_approval = ""
+
+    if "agent_typing" not in st.session_state:
+        st.session_state.agent_typing = None
+
     # Session management
     if "conversation_id" not in st.session_state:
         st.session_state.conversation_id = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -91,6 +189,19 @@ def initialize_session_state():
         st.session_state.last_error = None
 
 
+# Log entry renderers, keyed by entry type
+_LOG_RENDERERS: Dict[str, Callable[[str], Any]] = {
+    "thought": lambda content: st.markdown(f"💡 **Agent Thought:** {content}"),
+    "action": lambda content: st.markdown(f"🛠️ **Tool Call:** `{content}`"),
+    "observation": lambda content: st.markdown(f"✅ **Observation:** {content}"),
+    "error": lambda content: st.error(f"⚠️ **Error:** {content}"),
+}
+
+
+def _render_unknown_entry(content: str) -> Any:
+    return st.text(f"📝 {content}")
+
+
 # Display log entries with proper formatting
 def display_log(log_entries: List[Dict[str, Any]]):
     """Display the agent's execution log with appropriate formatting"""
@@ -99,23 +210,34 @@ def display_log(log_entries: List[Dict[str, Any]]):
         return
 
     for entry in log_entries:
-        entry_type = entry.get("type", "unknown")
-        content = entry.get("content", "")
-
-        if entry_type == "thought":
-            st.markdown(f"💡 **Agent Thought:** {content}")
-        elif entry_type == "action":
-            st.markdown(f"🛠️ **Tool Call:** `{content}`")
-        elif entry_type == "observation":
-            st.markdown(f"✅ **Observation:** {content}")
-        elif entry_type == "error":
-            st.error(f"⚠️ **Error:** {content}")
-        else:
-            st.text(f"📝 {content}")
-
+        render = _LOG_RENDERERS.get(entry.get("type", "unknown"), _render_unknown_entry)
+        render(entry.get("content", ""))
         st.divider()
 
 
+# Custom CSS for better chat styling
+_GLOBAL_CSS = (
+    "<style>"
+    ".chat-container{max-height:600px;overflow-y:auto;padding:10px;border:1px solid #e0e0e0;"
+    "border-radius:10px;background-color:#fafafa;margin-bottom:20px;}"
+    ".input-container{position:fixed;bottom:0;left:0;right:0;background-color:white;"
+    "padding:20px;border-top:1px solid #e0e0e0;z-index:1000;}"
+    ".main-content{margin-bottom:120px;}"
+    "</style>"
+)
+
+# Shown in place of the chat until the first message is sent
+_WELCOME_HTML = (
+    '<div style="text-align: center; padding: 40px; color: #666;">'
+    '<div style="font-size: 3em; margin-bottom: 20px;">🤖</div>'
+    "<h3>Welcome to BrowserFreak!</h3>"
+    "<p>I'm your AI-powered browser automation assistant. Describe what you'd like me to do "
+    "in the browser, and I'll handle it for you.</p>"
+    '<p style="font-size: 0.9em; margin-top: 20px;">Try asking me to navigate to a website, '
+    "fill out a form, or search for information.</p>"
+    "</div>"
+)
+
 # Task templates for quick selection
 TASK_TEMPLATES = {
     "Basic Navigation": "Navigate to example.com and describe what you see",
@@ -127,21 +249,22 @@ TASK_TEMPLATES = {
 }
 
 
-async def execute_agent_task(
+async def stream_agent_task(
     task: str, use_real_browser: Optional[bool] = None, max_iterations: Optional[int] = None
-) -> tuple[List[Dict[str, Any]], bool, str]:
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Execute agent task with proper configuration and error handling.
+    Execute agent task, yielding log entries as the workflow produces them.
 
     Args:
         task: The task description
         use_real_browser: Override browser setting (optional)
         max_iterations: Override max iterations (optional)
 
-    Returns:
-        Tuple of (log_entries, requires_approval, action_details)
+    Yields:
+        Log entries with a "type", an optional "subtype" and unprefixed "content";
+        an "approval_required" entry means the run stopped on an action that
+        needs human approval
     """
-    log_entries = []
     start_time = datetime.now()
 
     # Use configuration defaults if not specified
@@ -156,97 +279,133 @@ async def execute_agent_task(
         )
 
         # Add initial log entry
-        log_entries.append(
-            {
-                "type": "thought",
-                "timestamp": start_time.isoformat(),
-                "content": f"🚀 Starting execution for task: '{task}'",
-            }
-        )
+        yield {
+            "type": "thought",
+            "subtype": "start",
+            "timestamp": start_time.isoformat(),
+            "content": task,
+        }
 
-        # Execute the agent workflow
-        result = await run_agent_workflow(
+        # Execute the agent workflow, emitting messages as they are appended
+        result: Dict[str, Any] = {}
+        seen = 0
+        async for result in stream_agent_workflow(
             task, max_iterations=max_iterations, use_real_browser=use_real_browser
-        )
-
-        # Process messages and create log entries
-        for message in result.get("messages", []):
-            entry = {
-                "timestamp": datetime.now().isoformat(),
-                "role": message.get("role", "unknown"),
-            }
+        ):
+            messages = result.get("messages", [])
+            for message in messages[seen:]:
+                entry = {
+                    "timestamp": datetime.now().isoformat(),
+                    "role": message.get("role", "unknown"),
+                }
 
-            if message.get("role") == "user":
-                entry.update(
-                    {"type": "thought", "content": f"🧠 User request: {message['content']}"}
-                )
-            elif message.get("role") == "assistant":
-                if "tool_calls" in message:
-                    for tool_call in message["tool_calls"]:
-                        log_entries.append(
-                            {
+                if message.get("role") == "user":
+                    entry.update(
+                        {
+                            "type": "thought",
+                            "subtype": "user_request",
+                            "content": message["content"],
+                        }
+                    )
+                elif message.get("role") == "assistant":
+                    if "tool_calls" in message:
+                        for tool_call in message["tool_calls"]:
+                            yield {
                                 "type": "action",
                                 "timestamp": datetime.now().isoformat(),
                                 "content": f"{tool_call['name']} with args: {tool_call['args']}",
                                 "tool_call": tool_call,
                             }
+                    else:
+                        entry.update(
+                            {
+                                "type": "thought",
+                                "subtype": "agent_response",
+                                "content": message["content"],
+                            }
                         )
-                else:
+                elif message.get("role") == "tool":
                     entry.update(
-                        {"type": "thought", "content": f"💡 Agent response: {message['content']}"}
+                        {
+                            "type": "observation",
+                            "subtype": "tool_result",
+                            "content": message["content"],
+                        }
                     )
-            elif message.get("role") == "tool":
-                entry.update(
-                    {"type": "observation", "content": f"✅ Tool result: {message['content']}"}
-                )
-            else:
-                continue
+                else:
+                    continue
 
-            log_entries.append(entry)
+                yield entry
+            seen = len(messages)
 
         # Check if human approval is needed
         browser_action = result.get("browser_action")
         if browser_action and settings.agent.enable_security_checks:
-            log_entries.append(
-                {
-                    "type": "thought",
-                    "timestamp": datetime.now().isoformat(),
-                    "content": f"⚠️ Human approval required for: {browser_action}",
-                }
-            )
             log.warning(f"Security approval required for action: {browser_action}")
-            return log_entries, True, browser_action
+            yield {
+                "type": "thought",
+                "subtype": "approval_required",
+                "timestamp": datetime.now().isoformat(),
+                "content": browser_action,
+            }
+            return
 
         # Task completion
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
 
-        log_entries.append(
-            {
-                "type": "thought",
-                "timestamp": end_time.isoformat(),
-                "content": f"🎉 Task completed successfully in {duration:.1f}s!",
-            }
-        )
-
         log.info(f"Agent task completed successfully in {duration:.1f}s")
-        return log_entries, False, ""
+        yield {
+            "type": "thought",
+            "subtype": "complete",
+            "timestamp": end_time.isoformat(),
+            "content": f"Task completed successfully in {duration:.1f}s",
+        }
 
     except BrowserFreakError as e:
         error_msg = f"BrowserFreak error: {str(e)}"
         log.error(error_msg)
-        log_entries.append(
-            {"type": "error", "timestamp": datetime.now().isoformat(), "content": f"❌ {error_msg}"}
-        )
-        return log_entries, False, ""
+        yield {
+            "type": "error",
+            "timestamp": datetime.now().isoformat(),
+            "content": error_msg,
+        }
 
     except Exception as e:
         error_msg = f"Unexpected error during execution: {str(e)}"
         log.error(error_msg, exc_info=True)
-        log_entries.append(
-            {"type": "error", "timestamp": datetime.now().isoformat(), "content": f"❌ {error_msg}"}
+        yield {
+            "type": "error",
+            "timestamp": datetime.now().isoformat(),
+            "content": error_msg,
+        }
+
+
+async def execute_agent_task(
+    task: str, use_real_browser: Optional[bool] = None, max_iterations: Optional[int] = None
+) -> tuple[List[Dict[str, Any]], bool, str]:
+    """
+    Execute agent task with proper configuration and error handling.
+
+    Args:
+        task: The task description
+        use_real_browser: Override browser setting (optional)
+        max_iterations: Override max iterations (optional)
+
+    Returns:
+        Tuple of (log_entries, requires_approval, action_details)
+    """
+    log_entries = [
+        entry
+        async for entry in stream_agent_task(
+            task, use_real_browser=use_real_browser, max_iterations=max_iterations
         )
-        return log_entries, False, ""
+    ]
+    action_details = next(
+        (entry["content"] for entry in log_entries if entry.get("subtype") == "approval_required"),
+        "",
+    )
+    return log_entries, bool(action_details), action_details
 
 
 # Main execution handler
@@ -283,34 +442,31 @@ async def handle_agent_execution(
             {
                 "type": "error",
                 "timestamp": datetime.now().isoformat(),
-                "content": f"❌ Execution failed: {str(e)}",
+                "content": f"Execution failed: {str(e)}",
             }
         )
         st.session_state.execution_in_progress = False
 
 
-def create_download_link(data: str, filename: str, link_text: str) -> str:
-    """Create a download link for data export"""
-    b64 = base64.b64encode(data.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">{link_text}</a>'
-    return href
+@st.cache_data(show_spinner=False, max_entries=8)
+def _export_payload(msg_count: int, last_ts: str, _messages: List[Dict[str, Any]]) -> str:
+    """Serialize the chat for export, keyed on message count and last timestamp"""
+    return json.dumps(_messages, indent=2)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_health() -> Dict[str, Any]:
+    """Run the browser health check, reusing the result for 30 seconds"""
+    return run_in_background(health_check(), timeout=10)
 
 
 def display_health_status():
     """Display system health information"""
+    if st.button("🔄 Refresh", key="refresh_health", use_container_width=True):
+        _cached_health.clear()
+
     try:
-        # Use asyncio in a separate thread to avoid Streamlit event loop conflicts
-        def run_health_check():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(health_check())
-            finally:
-                loop.close()
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_health_check)
-            health_status = future.result(timeout=10)  # 10 second timeout
+        health_status = _cached_health()
 
         if health_status["status"] == "healthy":
             st.success("✅ System Health: Good")
@@ -348,264 +504,257 @@ def display_health_status():
         )
 
 
-def display_message(message: Dict[str, Any]):
-    """Display a single chat message with proper styling"""
-    role = message.get("role", "unknown")
-    content = message.get("content", "")
-    timestamp = message.get("timestamp", datetime.now())
+# Chat bubble HTML per role, filled with (time_str, content)
+_MESSAGE_TEMPLATES: Dict[str, str] = {
+    # User message (right-aligned)
+    "user": (
+        '<div style="background-color: #007bff; color: white; padding: 10px; border-radius: 10px; margin: 5px 0 5px 25%%; text-align: right;">'
+        '<div style="font-size: 0.8em; opacity: 0.8; margin-bottom: 5px;">%s</div>'
+        "%s</div>"
+    ),
+    # Assistant message (left-aligned)
+    "assistant": (
+        '<div style="background-color: #f1f1f1; color: black; padding: 10px; border-radius: 10px; margin: 5px 25%% 5px 0;">'
+        '<div style="font-size: 0.8em; opacity: 0.8; margin-bottom: 5px;">🤖 BrowserFreak • %s</div>'
+        "%s</div>"
+    ),
+    # Tool execution message
+    "tool": (
+        '<div style="background-color: #e9ecef; color: #495057; padding: 8px; border-radius: 8px; margin: 3px 0; border-left: 3px solid #28a745;">'
+        '<div style="font-size: 0.8em; opacity: 0.7;">🔧 Tool Result • %s</div>'
+        '<div style="font-family: monospace; font-size: 0.9em; margin-top: 5px;">%s</div></div>'
+    ),
+    # Error message
+    "error": (
+        '<div style="background-color: #f8d7da; color: #721c24; padding: 8px; border-radius: 8px; margin: 3px 0; border-left: 3px solid #dc3545;">'
+        '<div style="font-size: 0.8em; opacity: 0.7;">❌ Error • %s</div>'
+        '<div style="margin-top: 5px;">%s</div></div>'
+    ),
+    # System message
+    "system": (
+        '<div style="background-color: #fff3cd; color: #856404; padding: 6px; border-radius: 6px; margin: 2px 0; border-left: 3px solid #ffc107;">'
+        '<div style="font-size: 0.8em;">ℹ️ System • %s</div>'
+        '<div style="margin-top: 3px;">%s</div></div>'
+    ),
+}
 
-    if isinstance(timestamp, str):
-        timestamp = datetime.fromisoformat(timestamp)
 
-    # Format timestamp
-    time_str = timestamp.strftime("%H:%M")
+def _message_html(message: Dict[str, Any]) -> str:
+    """Render a single chat message as a styled HTML block"""
+    template = _MESSAGE_TEMPLATES.get(message.get("role", "unknown"))
+    if template is None:
+        return ""
+    return template % (message.get("time_str", ""), message.get("content", ""))
 
-    if role == "user":
-        # User message (right-aligned)
-        col1, col2 = st.columns([1, 3])
-        with col2:
-            st.markdown(
-                f"""
-            <div style="background-color: #007bff; color: white; padding: 10px; border-radius: 10px; margin: 5px 0; text-align: right;">
-                <div style="font-size: 0.8em; opacity: 0.8; margin-bottom: 5px;">{time_str}</div>
-                {content}
-            </div>
-            """,
-                unsafe_allow_html=True,
-            )
-    elif role == "assistant":
-        # Assistant message (left-aligned)
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.markdown(
-                f"""
-            <div style="background-color: #f1f1f1; color: black; padding: 10px; border-radius: 10px; margin: 5px 0;">
-                <div style="font-size: 0.8em; opacity: 0.8; margin-bottom: 5px;">🤖 BrowserFreak • {time_str}</div>
-                {content}
-            </div>
-            """,
-                unsafe_allow_html=True,
-            )
-    elif role == "tool":
-        # Tool execution message
-        st.markdown(
-            f"""
-        <div style="background-color: #e9ecef; color: #495057; padding: 8px; border-radius: 8px; margin: 3px 0; border-left: 3px solid #28a745;">
-            <div style="font-size: 0.8em; opacity: 0.7;">🔧 Tool Result • {time_str}</div>
-            <div style="font-family: monospace; font-size: 0.9em; margin-top: 5px;">{content}</div>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-    elif role == "error":
-        # Error message
-        st.markdown(
-            f"""
-        <div style="background-color: #f8d7da; color: #721c24; padding: 8px; border-radius: 8px; margin: 3px 0; border-left: 3px solid #dc3545;">
-            <div style="font-size: 0.8em; opacity: 0.7;">❌ Error • {time_str}</div>
-            <div style="margin-top: 5px;">{content}</div>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-    elif role == "system":
-        # System message
-        st.markdown(
-            f"""
-        <div style="background-color: #fff3cd; color: #856404; padding: 6px; border-radius: 6px; margin: 2px 0; border-left: 3px solid #ffc107;">
-            <div style="font-size: 0.8em;">ℹ️ System • {time_str}</div>
-            <div style="margin-top: 3px;">{content}</div>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
+
+# Messages per chat markdown element; full blocks never change once complete
+_CHAT_BLOCK_SIZE = 25
+
+
+def _chat_blocks(messages: List[Dict[str, Any]]) -> List[str]:
+    """HTML for the conversation split into blocks of _CHAT_BLOCK_SIZE messages"""
+    # The chat is append-only, so completed blocks are rendered once per session
+    cache: List[str] = st.session_state.setdefault("chat_block_html", [])
+    full_blocks = len(messages) // _CHAT_BLOCK_SIZE
+    del cache[full_blocks:]
+    for index in range(len(cache), full_blocks):
+        block = messages[index * _CHAT_BLOCK_SIZE : (index + 1) * _CHAT_BLOCK_SIZE]
+        cache.append("".join(_message_html(message) for message in block))
+
+    tail = "".join(_message_html(message) for message in messages[full_blocks * _CHAT_BLOCK_SIZE :])
+    return cache + [tail] if tail else list(cache)
+
+
+def _first_visible_block(message_count: int) -> int:
+    """Index of the first block that holds one of the most recent messages"""
+    if st.session_state.get("show_earlier_messages"):
+        return 0
+    max_visible: int = st.session_state.get(
+        "max_visible_messages", settings.ui.max_visible_messages
+    )
+    return max(0, message_count - max_visible) // _CHAT_BLOCK_SIZE
 
 
 def display_chat_messages():
     """Display all chat messages in the conversation"""
     if not st.session_state.messages:
-        # Welcome message
-        st.markdown(
-            """
-        <div style="text-align: center; padding: 40px; color: #666;">
-            <div style="font-size: 3em; margin-bottom: 20px;">🤖</div>
-            <h3>Welcome to BrowserFreak!</h3>
-            <p>I'm your AI-powered browser automation assistant. Describe what you'd like me to do in the browser, and I'll handle it for you.</p>
-            <p style="font-size: 0.9em; margin-top: 20px;">Try asking me to navigate to a website, fill out a form, or search for information.</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(_WELCOME_HTML, unsafe_allow_html=True)
         return
 
-    for message in st.session_state.messages:
-        display_message(message)
+    # Unchanged blocks are identical deltas, which Streamlit sends to the browser by
+    # reference; only the block holding new messages goes over the wire in full.
+    # Hidden history starts on a block boundary so the visible blocks stay stable.
+    messages = st.session_state.messages
+    for html in _chat_blocks(messages)[_first_visible_block(len(messages)) :]:
+        st.markdown(html, unsafe_allow_html=True)
+
+
+def _chat_message(role: str, content: str) -> Dict[str, Any]:
+    """Build a chat message, formatting its display time once at creation"""
+    now = datetime.now()
+    return {
+        "role": role,
+        "content": content,
+        "timestamp": now.isoformat(),
+        "time_str": now.strftime("%H:%M"),
+    }
 
 
-def process_user_message_sync(
+# Chat message (role, template) for each log entry (type, subtype) shown in the chat
+_CHAT_MESSAGE_FORMATS: Dict[Tuple[str, Optional[str]], Tuple[str, str]] = {
+    ("thought", "agent_response"): ("assistant", "%s"),
+    ("action", None): ("assistant", "🔧 Executing: %s"),
+    ("observation", "tool_result"): ("tool", "%s"),
+    ("error", None): ("error", "%s"),
+}
+
+
+def log_entry_to_message(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Convert an agent log entry into a chat message, if it should be shown"""
+    chat_format = _CHAT_MESSAGE_FORMATS.get((entry.get("type", ""), entry.get("subtype")))
+    if chat_format is None:
+        return None
+
+    role, template = chat_format
+    return _chat_message(role, template % entry.get("content", ""))
+
+
+def submit_user_message(
     user_input: str, use_real_browser: bool = False, max_iterations: int = 5
-):
-    """Process a user message and generate agent response (synchronous wrapper)"""
+) -> None:
+    """Start processing a user message on the background loop without waiting for it"""
     # Add user message to chat
-    user_message = {"role": "user", "content": user_input, "timestamp": datetime.now().isoformat()}
+    user_message = _chat_message("user", user_input)
     st.session_state.messages.append(user_message)
 
-    # Add typing indicator
-    typing_message = {
-        "role": "system",
-        "content": "🤖 BrowserFreak is thinking...",
-        "timestamp": datetime.now().isoformat(),
-    }
-    st.session_state.messages.append(typing_message)
+    # Typing indicator, rendered by the progress fragment rather than kept in the chat
+    st.session_state.agent_typing = _chat_message("system", "🤖 BrowserFreak is thinking...")
+
+    # Entries are produced on the background loop and drained by the progress fragment
+    entries: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+
+    async def pump_entries() -> None:
+        try:
+            async for entry in stream_agent_task(
+                user_input, use_real_browser=use_real_browser, max_iterations=max_iterations
+            ):
+                entries.put(entry)
+        except asyncio.CancelledError:
+            log.info("Agent task cancelled")
+            raise
+
+    st.session_state.agent_entries = entries
+    st.session_state.agent_approval = ""
+    st.session_state.agent_deadline = time.monotonic() + 30  # 30 second timeout
+    st.session_state.agent_future = asyncio.run_coroutine_threadsafe(pump_entries(), _get_bg_loop())
+    st.session_state.execution_in_progress = True
 
-    try:
-        # Use asyncio.run() in a separate thread to avoid Streamlit event loop conflicts
-        def run_async_task():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(
-                    execute_agent_task(
-                        user_input, use_real_browser=use_real_browser, max_iterations=max_iterations
-                    )
-                )
-            finally:
-                loop.close()
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(run_async_task)
-            log_entries, requires_approval, action_details = future.result(
-                timeout=30
-            )  # 30 second timeout
-
-        # Remove typing indicator
-        if st.session_state.messages and st.session_state.messages[-1]["role"] == "system":
-            st.session_state.messages.pop()
-
-        # Process the results and create chat messages
-        agent_response = ""
-        tool_results = []
-
-        for log_entry in log_entries:
-            entry_type = log_entry.get("type", "")
-            content = log_entry.get("content", "")
-
-            if entry_type == "thought" and "Agent response:" in content:
-                # Extract agent response
-                agent_response = content.replace("💡 Agent response: ", "")
-            elif entry_type == "action":
-                # Tool call
-                tool_msg = {
-                    "role": "assistant",
-                    "content": f"🔧 Executing: {content}",
-                    "timestamp": datetime.now().isoformat(),
-                }
-                st.session_state.messages.append(tool_msg)
-            elif entry_type == "observation":
-                # Tool result
-                if "Tool result:" in content:
-                    tool_result = content.replace("✅ Tool result: ", "")
-                    tool_results.append(tool_result)
-                elif "Human approved action:" in content:
-                    approval_msg = {
-                        "role": "system",
-                        "content": f"✅ {content.replace('Human approved action: ', '')}",
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                    st.session_state.messages.append(approval_msg)
-            elif entry_type == "error":
-                error_msg = {
-                    "role": "error",
-                    "content": content.replace("❌ ", ""),
-                    "timestamp": datetime.now().isoformat(),
-                }
-                st.session_state.messages.append(error_msg)
 
-        # Add agent response if any
-        if agent_response:
-            response_msg = {
-                "role": "assistant",
-                "content": agent_response,
-                "timestamp": datetime.now().isoformat(),
-            }
-            st.session_state.messages.append(response_msg)
+# Streamed entries are coalesced into one chat render per interval, at most a batch at a time
+_RENDER_INTERVAL = 0.03
+_RENDER_BATCH_SIZE = 24
 
-        # Add tool results
-        for tool_result in tool_results:
-            tool_msg = {
-                "role": "tool",
-                "content": tool_result,
-                "timestamp": datetime.now().isoformat(),
-            }
-            st.session_state.messages.append(tool_msg)
 
-        # Handle approval required
-        if requires_approval:
-            st.session_state.pending_approval = True
-            st.session_state.pending_action = action_details
+def _drain_agent_entries(limit: Optional[int] = None) -> bool:
+    """Move queued agent log entries into the chat, returning whether any arrived"""
+    entries: "queue.Queue[Dict[str, Any]]" = st.session_state.agent_entries
+    received = 0
 
-            approval_msg = {
-                "role": "system",
-                "content": f"⚠️ **Security Approval Required:** {action_details}",
-                "timestamp": datetime.now().isoformat(),
-            }
-            st.session_state.messages.append(approval_msg)
+    while not entries.empty() and (limit is None or received < limit):
+        log_entry = entries.get_nowait()
+        received += 1
 
-    except concurrent.futures.TimeoutError:
+        if log_entry.get("subtype") == "approval_required":
+            st.session_state.agent_approval = log_entry["content"]
+            continue
+
+        chat_message = log_entry_to_message(log_entry)
+        if chat_message:
+            st.session_state.messages.append(chat_message)
+
+    return received > 0
+
+
+def _finish_agent_run(future: "concurrent.futures.Future[None]", timed_out: bool) -> None:
+    """Record the outcome of a finished, cancelled or timed out agent run"""
+    _drain_agent_entries()
+    st.session_state.agent_future = None
+    st.session_state.execution_in_progress = False
+
+    if timed_out:
         # Track error
         st.session_state.error_count += 1
         st.session_state.last_error = "Request timed out after 30 seconds"
 
-        # Remove typing indicator
-        if st.session_state.messages and st.session_state.messages[-1]["role"] == "system":
-            st.session_state.messages.pop()
-
         # Add timeout error message
-        error_msg = {
-            "role": "error",
-            "content": "Request timed out. The operation took too long to complete.",
-            "timestamp": datetime.now().isoformat(),
-        }
+        error_msg = _chat_message(
+            "error", "Request timed out. The operation took too long to complete."
+        )
         st.session_state.messages.append(error_msg)
 
-    except Exception as e:
+    elif future.cancelled():
+        stopped_msg = _chat_message("system", "⏹️ Stopped by user")
+        st.session_state.messages.append(stopped_msg)
+
+    elif future.exception() is not None:
         # Track error
         st.session_state.error_count += 1
-        st.session_state.last_error = str(e)
-
-        # Remove typing indicator
-        if st.session_state.messages and st.session_state.messages[-1]["role"] == "system":
-            st.session_state.messages.pop()
+        st.session_state.last_error = str(future.exception())
 
         # Add error message
-        error_msg = {
-            "role": "error",
-            "content": f"Failed to process request: {str(e)}",
-            "timestamp": datetime.now().isoformat(),
-        }
+        error_msg = _chat_message("error", f"Failed to process request: {future.exception()}")
         st.session_state.messages.append(error_msg)
 
+    elif st.session_state.agent_approval:
+        # Handle approval required
+        st.session_state.pending_approval = True
+        st.session_state.pending_action = st.session_state.agent_approval
+
+        approval_msg = _chat_message(
+            "system", f"⚠️ **Security Approval Required:** {st.session_state.agent_approval}"
+        )
+        st.session_state.messages.append(approval_msg)
+
+
+@st.fragment(run_every=_RENDER_INTERVAL)
+def _agent_progress_fragment(chat_slot: Any) -> None:
+    """Poll the running agent task, streaming its entries into the chat"""
+    future = st.session_state.agent_future
+    if future is None:
+        return
+
+    if st.button("⏹️ Stop", use_container_width=True):
+        future.cancel()
+
+    if _drain_agent_entries(limit=_RENDER_BATCH_SIZE):
+        with chat_slot.container():
+            display_chat_messages()
+    st.markdown(_message_html(st.session_state.agent_typing), unsafe_allow_html=True)
+
+    timed_out = False
+    if not future.done():
+        if time.monotonic() < st.session_state.agent_deadline:
+            return
+        future.cancel()
+        timed_out = True
+
+    _finish_agent_run(future, timed_out)
+    # Re-enable the input and refresh the sidebar once the run is over
+    st.rerun()
+
 
 def handle_approval_response(approved: bool):
     """Handle user approval/denial response"""
     if approved:
         # Add approval message
-        approval_msg = {
-            "role": "system",
-            "content": f"✅ Approved: {st.session_state.pending_action}",
-            "timestamp": datetime.now().isoformat(),
-        }
+        approval_msg = _chat_message("system", f"✅ Approved: {st.session_state.pending_action}")
         st.session_state.messages.append(approval_msg)
 
         # Mark task as complete
         st.session_state.task_complete = True
     else:
         # Add denial message
-        denial_msg = {
-            "role": "error",
-            "content": f"❌ Denied: {st.session_state.pending_action}",
-            "timestamp": datetime.now().isoformat(),
-        }
+        denial_msg = _chat_message("error", f"❌ Denied: {st.session_state.pending_action}")
         st.session_state.messages.append(denial_msg)
 
         # Reset execution state
@@ -616,41 +765,80 @@ def handle_approval_response(approved: bool):
     st.session_state.pending_action = ""
 
 
+@st.fragment
+def _input_fragment(use_real_browser: bool, max_iterations: int) -> None:
+    """Quick actions, text input and Send button, rerun on their own when used"""
+    # Quick action buttons
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if st.button(
+            "🌐 Navigate", use_container_width=True, disabled=st.session_state.execution_in_progress
+        ):
+            st.session_state.input_placeholder = "Navigate to example.com and describe what you see"
+    with col2:
+        if st.button(
+            "📝 Fill Form",
+            use_container_width=True,
+            disabled=st.session_state.execution_in_progress,
+        ):
+            st.session_state.input_placeholder = (
+                "Go to a contact form and fill it out with sample data"
+            )
+    with col3:
+        if st.button(
+            "🛒 Shop", use_container_width=True, disabled=st.session_state.execution_in_progress
+        ):
+            st.session_state.input_placeholder = "Find the highest rated chair on Amazon"
+    with col4:
+        if st.button(
+            "🔍 Search", use_container_width=True, disabled=st.session_state.execution_in_progress
+        ):
+            st.session_state.input_placeholder = "Search for 'Python programming' on Google"
+
+    # Main input area
+    user_input = st.text_area(
+        "Type your request...",
+        placeholder=getattr(
+            st.session_state,
+            "input_placeholder",
+            "Describe what you'd like me to do in the browser...",
+        ),
+        height=80,
+        key="user_input",
+        disabled=st.session_state.execution_in_progress,
+        label_visibility="collapsed",
+    )
+
+    # Send button
+    if st.button(
+        "🚀 Send",
+        type="primary",
+        use_container_width=True,
+        disabled=st.session_state.execution_in_progress or not user_input.strip(),
+    ):
+        # Clear placeholder
+        if hasattr(st.session_state, "input_placeholder"):
+            del st.session_state.input_placeholder
+
+        # Start processing the message; the progress fragment picks up the results
+        submit_user_message(
+            user_input.strip(), use_real_browser=use_real_browser, max_iterations=max_iterations
+        )
+        # The chat and sidebar live outside this fragment, so rerun the whole app
+        st.rerun()
+
+    # Status indicator
+    if st.session_state.execution_in_progress:
+        st.info("🤖 BrowserFreak is working on your request...")
+
+
 # Main UI
 def main():
     """Main Streamlit application - Chat-like interface"""
     initialize_session_state()
 
-    # Custom CSS for better chat styling
-    st.markdown(
-        """
-    <style>
-    .chat-container {
-        max-height: 600px;
-        overflow-y: auto;
-        padding: 10px;
-        border: 1px solid #e0e0e0;
-        border-radius: 10px;
-        background-color: #fafafa;
-        margin-bottom: 20px;
-    }
-    .input-container {
-        position: fixed;
-        bottom: 0;
-        left: 0;
-        right: 0;
-        background-color: white;
-        padding: 20px;
-        border-top: 1px solid #e0e0e0;
-        z-index: 1000;
-    }
-    .main-content {
-        margin-bottom: 120px;
-    }
-    </style>
-    """,
-        unsafe_allow_html=True,
-    )
+    # Streamlit drops elements a rerun does not emit, so the CSS goes out on every run
+    st.markdown(_GLOBAL_CSS, unsafe_allow_html=True)
 
     # Sidebar for settings and status
     with st.sidebar:
@@ -663,6 +851,10 @@ def main():
             value=settings.agent.use_real_browser,
             help="Use actual browser instead of mock mode",
         )
+        if use_real_browser and not st.session_state.get("browser_pool_warmed"):
+            # Launch the browser while the user types so the first task does not wait for it
+            asyncio.run_coroutine_threadsafe(warm_browser_pool(), _get_bg_loop())
+            st.session_state.browser_pool_warmed = True
         max_iterations = st.slider(
             "Max Iterations",
             min_value=1,
@@ -686,6 +878,15 @@ def main():
         st.subheader("💬 Conversation")
         st.write(f"**Messages:** {len(st.session_state.messages)}")
         st.write(f"**Session ID:** {st.session_state.conversation_id}")
+        st.number_input(
+            "Visible Messages",
+            min_value=10,
+            max_value=500,
+            value=settings.ui.max_visible_messages,
+            step=10,
+            key="max_visible_messages",
+            help="Older messages are hidden until you choose to show them",
+        )
 
         # Error tracking
         if st.session_state.error_count > 0:
@@ -704,23 +905,34 @@ def main():
                 initialize_session_state()
                 st.rerun()
         with col2:
-            if st.button("📥 Export", use_container_width=True):
-                if st.session_state.messages:
-                    chat_json = json.dumps(st.session_state.messages, indent=2)
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"browserfreak_chat_{timestamp}.json"
-                    st.markdown(
-                        create_download_link(chat_json, filename, "📥 Download Chat"),
-                        unsafe_allow_html=True,
-                    )
+            messages = st.session_state.messages
+            st.download_button(
+                "📥 Export",
+                data=(
+                    _export_payload(len(messages), messages[-1].get("timestamp", ""), messages)
+                    if messages
+                    else ""
+                ),
+                file_name=f"browserfreak_chat_{st.session_state.conversation_id}.json",
+                mime="application/json",
+                on_click="ignore",
+                disabled=not messages,
+                use_container_width=True,
+            )
 
     # Main chat interface
     st.title("🤖 BrowserFreak Chat")
     st.markdown("*Your AI-powered browser automation assistant*")
 
     # Chat container
+    if _first_visible_block(len(st.session_state.messages)) > 0 or st.session_state.get(
+        "show_earlier_messages"
+    ):
+        st.toggle("Show earlier messages", key="show_earlier_messages")
     st.markdown('<div class="chat-container">', unsafe_allow_html=True)
-    display_chat_messages()
+    chat_slot = st.empty()
+    with chat_slot.container():
+        display_chat_messages()
     st.markdown("</div>", unsafe_allow_html=True)
 
     # Security approval section (if needed)
@@ -741,71 +953,11 @@ def main():
     # Chat input at the bottom
     st.markdown('<div class="input-container">', unsafe_allow_html=True)
 
-    # Quick action buttons
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        if st.button(
-            "🌐 Navigate", use_container_width=True, disabled=st.session_state.execution_in_progress
-        ):
-            st.session_state.input_placeholder = "Navigate to example.com and describe what you see"
-            st.rerun()
-    with col2:
-        if st.button(
-            "📝 Fill Form",
-            use_container_width=True,
-            disabled=st.session_state.execution_in_progress,
-        ):
-            st.session_state.input_placeholder = (
-                "Go to a contact form and fill it out with sample data"
-            )
-            st.rerun()
-    with col3:
-        if st.button(
-            "🛒 Shop", use_container_width=True, disabled=st.session_state.execution_in_progress
-        ):
-            st.session_state.input_placeholder = "Find the highest rated chair on Amazon"
-            st.rerun()
-    with col4:
-        if st.button(
-            "🔍 Search", use_container_width=True, disabled=st.session_state.execution_in_progress
-        ):
-            st.session_state.input_placeholder = "Search for 'Python programming' on Google"
-            st.rerun()
-
-    # Main input area
-    user_input = st.text_area(
-        "Type your request...",
-        placeholder=getattr(
-            st.session_state,
-            "input_placeholder",
-            "Describe what you'd like me to do in the browser...",
-        ),
-        height=80,
-        key="user_input",
-        disabled=st.session_state.execution_in_progress,
-        label_visibility="collapsed",
-    )
+    # Agent progress and Stop button while a request is running
+    if st.session_state.agent_future is not None:
+        _agent_progress_fragment(chat_slot)
 
-    # Send button
-    if st.button(
-        "🚀 Send",
-        type="primary",
-        use_container_width=True,
-        disabled=st.session_state.execution_in_progress or not user_input.strip(),
-    ):
-        # Clear placeholder
-        if hasattr(st.session_state, "input_placeholder"):
-            del st.session_state.input_placeholder
-
-        # Process the message
-        process_user_message_sync(
-            user_input.strip(), use_real_browser=use_real_browser, max_iterations=max_iterations
-        )
-        st.rerun()
-
-    # Status indicator
-    if st.session_state.execution_in_progress:
-        st.info("🤖 BrowserFreak is working on your request...")
+    _input_fragment(use_real_browser, max_iterations)
 
     st.markdown("</div>", unsafe_allow_html=True)
 
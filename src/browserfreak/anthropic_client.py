@@ -3,15 +3,115 @@ Anthropic API client wrapper for BrowserFreak
 """
 
 import asyncio
-from typing import Any, Dict, List, Optional, cast
+import json
+import re
+from contextlib import aclosing
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
+from anthropic import AsyncAnthropic
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import Runnable
 
 from .config import settings
 from .exceptions import AnthropicAPIError, ConfigurationError
 from .logging_config import log
+from .tools import get_browser_tools, get_browser_tools_json
+
+try:
+    # orjson is an optional speedup for hashing tool schemas
+    import orjson
+
+    def _tools_key(tools: Sequence[Dict[str, Any]]) -> Union[bytes, str]:
+        return orjson.dumps(tools, option=orjson.OPT_SORT_KEYS)
+
+except ImportError:
+
+    def _tools_key(tools: Sequence[Dict[str, Any]]) -> Union[bytes, str]:
+        return json.dumps(tools, sort_keys=True)
+
+
+# System prompt shared by single and batch decisions; page context is a template variable
+_SYSTEM_PROMPT = """You are a browser automation assistant. Your task is to help users interact with web pages.
+
+Current page context:
+{page_context}
+
+Instructions:
+1. Analyze the user's request and current page context
+2. Use available tools to complete tasks
+3. For destructive actions, be cautious
+4. Respond with 'FINISH' when the task is complete
+
+Available tools will be provided separately."""
+
+# Decision prompt built once; every tool-bound chain composes this same template
+_SYSTEM_TEMPLATE = ChatPromptTemplate.from_messages(
+    [("system", _SYSTEM_PROMPT), MessagesPlaceholder(variable_name="messages")]
+)
+
+# Prompt for folding older conversation turns into the running history summary
+_SUMMARY_PROMPT = """Summarize this browser automation conversation for the assistant continuing it.
+Keep the user's goal, pages visited, actions taken with their results, and anything still pending.
+Be concise and factual.
+
+Summary so far:
+{summary}"""
+
+# Completion marker the system prompt asks for, matched as a whole word in any case
+_FINISH_RE = re.compile(r"\bFINISH\b", re.IGNORECASE)
+
+
+def _page_context_value(page_context: str) -> str:
+    """Page context as shown to the model, truncated to keep the prompt bounded"""
+    if not page_context:
+        return "No page context available"
+    # Short contexts are passed through without copying
+    return page_context if len(page_context) <= 2000 else page_context[:2000]
+
+
+def _history_line(msg: Dict[str, Any]) -> str:
+    """Render one message as a line of the transcript given to the summarizer"""
+    if "tool_calls" in msg:
+        calls = ", ".join(f"{call['name']}({call['args']})" for call in msg["tool_calls"])
+        return f"{msg.get('role')}: called {calls}"
+    return f"{msg.get('role')}: {msg.get('content', '')}"
+
+
+def _to_human_message(msg: Dict[str, Any]) -> HumanMessage:
+    return HumanMessage(content=msg.get("content", ""))
+
+
+def _to_ai_message(msg: Dict[str, Any]) -> AIMessage:
+    if "tool_calls" in msg:
+        # Tool call message
+        return AIMessage(content="", additional_kwargs={"tool_calls": msg["tool_calls"]})
+    return AIMessage(content=msg.get("content", ""))
+
+
+def _to_tool_message(msg: Dict[str, Any]) -> ToolMessage:
+    return ToolMessage(content=msg.get("content", ""), tool_call_id=msg.get("tool_call_id", "1"))
+
+
+# Internal role -> LangChain message constructor; messages with other roles are skipped
+_LANGCHAIN_CONVERTERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "user": _to_human_message,
+    "assistant": _to_ai_message,
+    "tool": _to_tool_message,
+}
 
 
 class AnthropicClient:
@@ -19,6 +119,9 @@ class AnthropicClient:
 
     def __init__(self):
         self._client: Optional[ChatAnthropic] = None
+        self._batch_client: Optional[AsyncAnthropic] = None
+        self._chain_cache: Dict[Union[bytes, str], Runnable] = {}
+        self._summary_chain: Optional[Runnable] = None
         self._initialize_client()
 
     def _initialize_client(self) -> None:
@@ -49,31 +152,145 @@ class AnthropicClient:
 
     def _convert_messages_to_langchain(self, messages: List[Dict[str, Any]]) -> List[Any]:
         """Convert internal message format to LangChain format"""
-        langchain_messages = []
+        converters = _LANGCHAIN_CONVERTERS
+        return [converters[msg["role"]](msg) for msg in messages if msg.get("role") in converters]
+
+    def _convert_messages_to_anthropic(
+        self, messages: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Convert internal message format to raw Anthropic Messages API format"""
+        anthropic_messages: List[Dict[str, Any]] = []
 
         for msg in messages:
             role = msg.get("role")
             content = msg.get("content", "")
 
             if role == "user":
-                langchain_messages.append(HumanMessage(content=content))
+                anthropic_messages.append({"role": "user", "content": content})
             elif role == "assistant":
                 if "tool_calls" in msg:
-                    # Tool call message
-                    additional_kwargs = {"tool_calls": msg["tool_calls"]}
-                    langchain_messages.append(
-                        AIMessage(content="", additional_kwargs=additional_kwargs)
-                    )
+                    blocks = [
+                        {
+                            "type": "tool_use",
+                            "id": tool_call.get("id", "1"),
+                            "name": tool_call["name"],
+                            "input": tool_call["args"],
+                        }
+                        for tool_call in msg["tool_calls"]
+                    ]
+                    anthropic_messages.append({"role": "assistant", "content": blocks})
                 else:
-                    langchain_messages.append(AIMessage(content=content))
+                    anthropic_messages.append({"role": "assistant", "content": content})
             elif role == "tool":
                 tool_call_id = msg.get("tool_call_id", "1")
-                langchain_messages.append(ToolMessage(content=content, tool_call_id=tool_call_id))
+                anthropic_messages.append(
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "tool_result", "tool_use_id": tool_call_id, "content": content}
+                        ],
+                    }
+                )
+
+        return anthropic_messages
+
+    def _build_system_prompt(self, page_context: str) -> str:
+        """Build the system prompt for a decision"""
+        return _SYSTEM_PROMPT.format(page_context=_page_context_value(page_context))
+
+    def _get_chain(self, tools: Sequence[Dict[str, Any]]) -> Runnable:
+        """Get the prompt and tool-bound model chain for a tool set, building it once"""
+        # The built-in tool list is static, so its serialized form is reused
+        key = get_browser_tools_json() if tools is get_browser_tools() else _tools_key(tools)
+        chain = self._chain_cache.get(key)
+        if chain is None:
+            chain = _SYSTEM_TEMPLATE | cast(ChatAnthropic, self._client).bind_tools(tools)
+            self._chain_cache[key] = chain
+        return chain
+
+    def _get_summary_chain(self) -> Runnable:
+        """Get the chain that summarizes conversation history, building it once"""
+        if self._summary_chain is None:
+            prompt = ChatPromptTemplate.from_messages(
+                [("system", _SUMMARY_PROMPT), ("human", "{history}")]
+            )
+            self._summary_chain = prompt | cast(ChatAnthropic, self._client) | StrOutputParser()
+        return self._summary_chain
+
+    async def _maybe_compact(
+        self, messages: List[Dict[str, Any]], history_summary: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Replace older messages with a running summary once the history grows long
+
+        Args:
+            messages: Conversation history
+            history_summary: Per-run summary state ({"text": str, "covered": int}),
+                updated in place when the history is resummarized
+
+        Returns:
+            The messages to send: unchanged, or a summary message plus the recent tail
+        """
+        config = settings.anthropic
+        if history_summary is None or len(messages) <= config.compact_threshold:
+            return messages
+
+        covered = history_summary.get("covered", 0)
+        if len(messages) - config.compact_keep - covered >= config.compact_delta:
+            # Never start the tail on a tool result whose tool call was summarized away
+            split = len(messages) - config.compact_keep
+            while split < len(messages) and messages[split].get("role") == "tool":
+                split += 1
+
+            log.debug(f"Summarizing messages {covered}-{split} of conversation history")
+            history_summary["text"] = await self._get_summary_chain().ainvoke(
+                {
+                    "summary": history_summary.get("text") or "(none)",
+                    "history": "\n".join(_history_line(msg) for msg in messages[covered:split]),
+                }
+            )
+            history_summary["covered"] = covered = split
+
+        if not covered:
+            return messages
+        summary_message = {"role": "user", "content": f"Summary so far: {history_summary['text']}"}
+        return [summary_message] + messages[covered:]
+
+    def _get_batch_client(self) -> AsyncAnthropic:
+        """Get the Anthropic SDK client used for Message Batches, creating it on first use"""
+        if self._batch_client is None:
+            self._batch_client = AsyncAnthropic(
+                api_key=cast(Any, settings.anthropic.api_key).get_secret_value(),
+                timeout=settings.anthropic.timeout,
+            )
+        return self._batch_client
+
+    def _chain_input(self, messages: List[Dict[str, Any]], page_context: str) -> Dict[str, Any]:
+        """Build the prompt variables for one decision"""
+        return {
+            "messages": self._convert_messages_to_langchain(messages),
+            "page_context": _page_context_value(page_context),
+        }
 
-        return langchain_messages
+    def _parse_response(self, response: Any) -> Dict[str, Any]:
+        """Turn a model response into a decision result"""
+        if hasattr(response, "tool_calls") and response.tool_calls:
+            tool_calls = []
+            for tool_call in response.tool_calls:
+                tool_calls.append({"name": tool_call["name"], "args": tool_call["args"]})
+            return {"tool_calls": tool_calls}
+        else:
+            content = str(getattr(response, "content", ""))
+            if _FINISH_RE.search(content):
+                return {"content": "FINISH"}
+            return {"content": content}
 
     async def make_decision(
-        self, messages: List[Dict[str, Any]], page_context: str, tools: List[Dict[str, Any]]
+        self,
+        messages: List[Dict[str, Any]],
+        page_context: str,
+        tools: Sequence[Dict[str, Any]],
+        history_summary: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Make a decision using Anthropic API
@@ -82,6 +299,8 @@ class AnthropicClient:
             messages: Conversation history
             page_context: Current page context
             tools: Available tools
+            history_summary: Per-run summary state; when given, long histories are
+                sent as a summary plus the most recent messages
 
         Returns:
             Decision result with tool_calls or content
@@ -90,58 +309,194 @@ class AnthropicClient:
             raise AnthropicAPIError("Anthropic client not available")
 
         try:
-            # Convert messages to LangChain format
-            langchain_messages = self._convert_messages_to_langchain(messages)
+            # Reuse the prompt template and tool binding for this tool set
+            chain = self._get_chain(tools)
+            messages = await self._maybe_compact(messages, history_summary)
 
-            # Create system prompt
-            system_prompt = f"""You are a browser automation assistant. Your task is to help users interact with web pages.
+            # Stream the response so a bare FINISH reply can return as soon as it arrives;
+            # leaving the loop closes the stream and aborts the rest of the generation.
+            # Any other reply is read to the end, since prose often precedes a tool call
+            log.debug("Making Anthropic API call")
+            response: Any = None
+            text = ""
+            can_finish_early = True
+            # astream is typed as an AsyncIterator but returns an async generator
+            stream = cast(
+                AsyncGenerator[Any, None], chain.astream(self._chain_input(messages, page_context))
+            )
+            async with aclosing(stream):
+                async for chunk in stream:
+                    response = chunk if response is None else response + chunk
+                    if not can_finish_early:
+                        continue
+                    if chunk.tool_call_chunks:
+                        can_finish_early = False
+                        continue
+                    text += chunk.text
+                    reply = text.strip().upper()
+                    if reply == "FINISH":
+                        log.debug("FINISH streamed, closing Anthropic response early")
+                        return {"content": "FINISH"}
+                    can_finish_early = "FINISH".startswith(reply)
 
-Current page context:
-{page_context[:2000] if page_context else 'No page context available'}
+            return self._parse_response(response)
 
-Instructions:
-1. Analyze the user's request and current page context
-2. Use available tools to complete tasks
-3. For destructive actions, be cautious
-4. Respond with 'FINISH' when the task is complete
+        except Exception as e:
+            log.error(f"Anthropic API call failed: {e}")
+            raise AnthropicAPIError(f"API call failed: {e}") from e
 
-Available tools will be provided separately."""
+    async def make_decisions(
+        self,
+        requests: List[Tuple[List[Dict[str, Any]], str]],
+        tools: Sequence[Dict[str, Any]],
+        max_concurrency: int = 10,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Make several interactive decisions through one chain.abatch call
 
-            # Create prompt template
-            prompt = ChatPromptTemplate.from_messages(
-                [
-                    ("system", system_prompt),
-                    MessagesPlaceholder(variable_name="messages"),
-                ]
-            )
+        Args:
+            requests: (messages, page_context) pairs, one per decision
+            tools: Available tools
+            max_concurrency: Maximum API calls in flight
 
-            # Bind tools to the model
-            tool_llm = cast(ChatAnthropic, self._client).bind_tools(tools)
+        Returns:
+            Decision results in request order, None where a call failed
+        """
+        if not self.is_available:
+            raise AnthropicAPIError("Anthropic client not available")
 
-            # Create the chain
-            chain = prompt | tool_llm
+        if len(requests) == 1:
+            messages, page_context = requests[0]
+            try:
+                return [await self.make_decision(messages, page_context, tools)]
+            except AnthropicAPIError:
+                return [None]
 
-            # Make the API call
-            log.debug("Making Anthropic API call")
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, chain.invoke, {"messages": langchain_messages}
+        try:
+            chain = self._get_chain(tools)
+            inputs = [
+                self._chain_input(messages, page_context) for messages, page_context in requests
+            ]
+        except Exception as e:
+            log.error(f"Anthropic batch preparation failed: {e}")
+            raise AnthropicAPIError(f"API call failed: {e}") from e
+
+        log.debug(f"Making {len(inputs)} Anthropic API calls via abatch")
+        responses = await chain.abatch(
+            inputs, config={"max_concurrency": max_concurrency}, return_exceptions=True
+        )
+
+        decisions: List[Optional[Dict[str, Any]]] = []
+        for index, response in enumerate(responses):
+            if isinstance(response, Exception):
+                log.warning(f"Anthropic API call {index} failed: {response}")
+                decisions.append(None)
+            else:
+                decisions.append(self._parse_response(response))
+        return decisions
+
+    async def _cancel_batch(self, batch_id: str) -> None:
+        """Cancel a Message Batch whose results are no longer awaited"""
+        try:
+            await self._get_batch_client().messages.batches.cancel(batch_id)
+            log.info(f"Cancelled Anthropic message batch {batch_id}")
+        except Exception as e:
+            log.warning(f"Failed to cancel Anthropic message batch {batch_id}: {e}")
+
+    async def make_batch_decisions(
+        self, requests: List[Tuple[List[Dict[str, Any]], str]], tools: Sequence[Dict[str, Any]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Make several decisions through the Anthropic Message Batches API
+
+        Batches are processed asynchronously by Anthropic at reduced cost, so this
+        suits bulk evaluation rather than interactive turns. A batch that has not ended
+        within the configured batch_timeout, or whose caller is cancelled, is cancelled.
+
+        Args:
+            requests: (messages, page_context) pairs, one per decision
+            tools: Available tools
+
+        Returns:
+            Decision results in request order, None where a batch entry did not succeed
+        """
+        if not self.is_available:
+            raise AnthropicAPIError("Anthropic client not available")
+
+        try:
+            client = self._get_batch_client()
+            anthropic_tools = [
+                {
+                    "name": tool["name"],
+                    "description": tool["description"],
+                    "input_schema": tool["parameters"],
+                }
+                for tool in tools
+            ]
+
+            batch = await client.messages.batches.create(
+                requests=cast(
+                    Any,
+                    [
+                        {
+                            "custom_id": str(index),
+                            "params": {
+                                "model": settings.anthropic.model,
+                                "max_tokens": settings.anthropic.max_tokens,
+                                "temperature": settings.anthropic.temperature,
+                                "system": self._build_system_prompt(page_context),
+                                "messages": self._convert_messages_to_anthropic(messages),
+                                "tools": anthropic_tools,
+                            },
+                        }
+                        for index, (messages, page_context) in enumerate(requests)
+                    ],
+                )
             )
+            log.info(f"Submitted Anthropic message batch {batch.id} ({len(requests)} requests)")
+
+            # Batches may take up to a day, so waiting is bounded; an abandoned batch is
+            # cancelled rather than left running
+            timeout = settings.anthropic.batch_timeout
+            try:
+                async with asyncio.timeout(timeout):
+                    while batch.processing_status != "ended":
+                        await asyncio.sleep(settings.anthropic.batch_poll_interval)
+                        batch = await client.messages.batches.retrieve(batch.id)
+            except TimeoutError:
+                await self._cancel_batch(batch.id)
+                raise TimeoutError(f"batch {batch.id} did not end within {timeout}s") from None
+            except asyncio.CancelledError:
+                await self._cancel_batch(batch.id)
+                raise
+
+            decisions: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+            async for entry in await client.messages.batches.results(batch.id):
+                if entry.result.type != "succeeded":
+                    log.warning(f"Batch request {entry.custom_id} ended as {entry.result.type}")
+                    continue
 
-            # Process response
-            if hasattr(response, "tool_calls") and response.tool_calls:
                 tool_calls = []
-                for tool_call in response.tool_calls:
-                    tool_calls.append({"name": tool_call["name"], "args": tool_call["args"]})
-                return {"tool_calls": tool_calls}
-            else:
-                content = str(getattr(response, "content", ""))
-                if "FINISH" in content.upper():
-                    return {"content": "FINISH"}
-                return {"content": content}
+                text_parts = []
+                for block in entry.result.message.content:
+                    if block.type == "tool_use":
+                        tool_calls.append({"name": block.name, "args": block.input})
+                    elif block.type == "text":
+                        text_parts.append(block.text)
+
+                if tool_calls:
+                    decisions[int(entry.custom_id)] = {"tool_calls": tool_calls}
+                else:
+                    content = "".join(text_parts)
+                    if _FINISH_RE.search(content):
+                        content = "FINISH"
+                    decisions[int(entry.custom_id)] = {"content": content}
+
+            return decisions
 
         except Exception as e:
-            log.error(f"Anthropic API call failed: {e}")
-            raise AnthropicAPIError(f"API call failed: {e}") from e
+            log.error(f"Anthropic batch call failed: {e}")
+            raise AnthropicAPIError(f"Batch API call failed: {e}") from e
 
 
 # Global client instance
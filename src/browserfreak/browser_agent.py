@@ -3,8 +3,14 @@ Browser automation agent for BrowserFreak
 """
 
 import asyncio
-from typing import Any, Dict, List, Optional
-
+import os
+import random
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, cast
+
+from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, StateGraph
 from typing_extensions import TypedDict
@@ -14,69 +20,95 @@ from .decision_engine import decision_engine
 from .exceptions import ValidationError
 from .logging_config import log
 from .security import security_manager
-from .tools import BrowserContext, execute_tool
+from .skill_cache import skill_cache
+from .tools import (
+    MOCK_PAGE_HTML,
+    BrowserContext,
+    cache_task_context,
+    evict_task_context,
+    execute_tools,
+    get_page_state_wrapper,
+    get_task_context,
+)
+
+# Completion marker returned by the decision engine, matched as a whole word in any case
+_FINISH_RE = re.compile(r"\bFINISH\b", re.IGNORECASE)
 
 
 # Define the state structure for our graph
 class AgentState(TypedDict):
     messages: List[Dict[str, Any]]  # Conversation history
     page_map: str  # Current DOM representation
+    page_map_dirty: bool  # Page may have changed since page_map was captured
     browser_action: str  # Pending action requiring approval
     task_complete: bool  # Flag to indicate task completion
+    history_summary: Dict[str, Any]  # Summary of older messages and how many it covers
+    skill_steps: List[Dict[str, Any]]  # Tool calls that succeeded this run, kept as a skill
+    skill_replay: bool  # The pending tool calls were replayed from the skill cache
+    tools_failed: bool  # A tool call failed this run, so its steps are not kept as a skill
 
 
-async def security_check_node(
-    state: AgentState, context: Optional[BrowserContext] = None
-) -> AgentState:
-    """Check the current page state and validate actions for security"""
-    log.debug("Running security check...")
+def _skill_turn(state: AgentState) -> Optional[Dict[str, Any]]:
+    """Get the tool calls of a skill recorded for this task, replayed as the first turn"""
+    if state.setdefault("skill_steps", []) or state.get("tools_failed"):
+        return None
+    skill = skill_cache.lookup(state["messages"][0]["content"])
+    if skill is None:
+        return None
+    log.info(f"Replaying skill with {len(skill)} tool calls")
+    return {"tool_calls": [dict(step) for step in skill]}
 
-    # Update page state if we have a browser context
-    if context:
-        from .tools import get_page_state_wrapper
 
-        state["page_map"] = await get_page_state_wrapper(context)
+async def _refresh_page_map(state: AgentState, context: Optional[BrowserContext]) -> None:
+    """Update page state if we have a browser context and the page may have changed"""
+    if context:
+        if state.get("page_map_dirty", True):
+            state["page_map"] = await get_page_state_wrapper(context)
+            state["page_map_dirty"] = False
     else:
         # Mock page state for testing
-        state["page_map"] = "<html><body><button>Submit</button></body></html>"
-
-    # Check if there's a pending browser action that needs approval
-    if state.get("browser_action"):
-        log.info(f"Waiting for human approval on action: {state['browser_action']}")
-        # In a real implementation, this would pause and wait for human input
-        # For now, we'll simulate approval by clearing the action
-        state["browser_action"] = ""
-
-    log.debug("Security check completed")
-    return state
+        state["page_map"] = MOCK_PAGE_HTML
 
 
-async def agent_node(state: AgentState) -> AgentState:
-    """Agent node that decides the next action"""
+async def agent_node(state: AgentState, context: Optional[BrowserContext] = None) -> AgentState:
+    """Agent node that refreshes the page state and decides the next action"""
     log.debug("Agent node: Deciding next action...")
 
-    # Get agent decision
-    result = await decision_engine.make_decision(state["messages"], state["page_map"])
+    # The page check runs here rather than in its own node to save a graph step
+    await _refresh_page_map(state, context)
+
+    # Get agent decision, replaying a recorded skill for this task when there is one
+    result = _skill_turn(state)
+    state["skill_replay"] = result is not None
+    if result is None:
+        result = await decision_engine.make_decision(
+            state["messages"], state["page_map"], state.setdefault("history_summary", {})
+        )
 
     # Check if the agent wants to use a tool
     if "tool_calls" in result:
-        tool_call = result["tool_calls"][0]
-        action_name = tool_call["name"]
-        action_args = tool_call["args"]
+        # All calls of the turn run as one batch; number them so each result can be
+        # matched to its call
+        tool_calls = [
+            {"id": str(index + 1), **tool_call}
+            for index, tool_call in enumerate(result["tool_calls"])
+        ]
 
         # Check for destructive actions requiring approval
-        if security_manager.should_require_approval(action_name, action_args):
-            approval_message = security_manager.get_approval_message(action_name, action_args)
-            log.warning(f"Destructive action detected: {approval_message}")
-            state["browser_action"] = approval_message
-            state["messages"].append({"role": "assistant", "tool_calls": [tool_call]})
-            return state
-
-        # Add the tool call to messages
-        state["messages"].append({"role": "assistant", "tool_calls": [tool_call]})
+        for tool_call in tool_calls:
+            action_name = tool_call["name"]
+            action_args = tool_call["args"]
+            if security_manager.should_require_approval(action_name, action_args):
+                approval_message = security_manager.get_approval_message(action_name, action_args)
+                log.warning(f"Destructive action detected: {approval_message}")
+                state["browser_action"] = approval_message
+                break
+
+        # Add the tool calls to messages
+        state["messages"].append({"role": "assistant", "tool_calls": tool_calls})
         return state
 
-    elif "FINISH" in str(result.get("content", "")).upper():
+    elif _FINISH_RE.search(result.get("content") or ""):
         state["task_complete"] = True
         state["messages"].append({"role": "assistant", "content": "Task completed successfully"})
         return state
@@ -89,71 +121,95 @@ async def agent_node(state: AgentState) -> AgentState:
 
 
 async def tool_node(state: AgentState, context: Optional[BrowserContext] = None) -> AgentState:
-    """Execute the tool requested by the agent"""
-    log.debug("Tool node: Executing requested action...")
+    """Execute the tools requested by the agent"""
+    log.debug("Tool node: Executing requested actions...")
 
     # Get the last message (should be a tool call)
     last_message = state["messages"][-1]
 
     if "tool_calls" in last_message:
-        tool_call = last_message["tool_calls"][0]
-        tool_name = tool_call["name"]
-        tool_args = tool_call["args"]
-
-        log.info(f"Executing tool: {tool_name}")
-
-        # Execute the tool
-        result = await execute_tool(tool_name, tool_args, context)
-
-        # Update page state for get_page_state tool
-        if tool_name == "get_page_state" and context:
-            from .tools import get_page_state_wrapper
-
-            state["page_map"] = await get_page_state_wrapper(context)
-
-        # Add tool result to messages
-        tool_result = {
-            "role": "tool",
-            "tool_call_id": tool_call.get("id", "1"),
-            "content": f"Tool {tool_name} executed with result: {result}",
-        }
-        state["messages"].append(tool_result)
+        tool_calls = last_message["tool_calls"]
+
+        log.info(f"Executing tools: {', '.join(call['name'] for call in tool_calls)}")
+
+        # Execute the tools, running scrolls of different elements concurrently
+        results = await execute_tools(
+            [(tool_call["name"], tool_call["args"]) for tool_call in tool_calls], context
+        )
+
+        # Update page state when the batch ends with a snapshot; any other tool may
+        # change the page
+        last_name, last_result = tool_calls[-1]["name"], results[-1]
+        if last_name == "get_page_state" and context and last_result:
+            state["page_map"] = last_result
+            state["page_map_dirty"] = False
+        elif (
+            last_name == "navigate_and_snapshot"
+            and context
+            and last_result
+            and last_result["html"] is not None
+        ):
+            state["page_map"] = last_result["html"]
+            state["page_map_dirty"] = False
+        else:
+            state["page_map_dirty"] = True
 
         # Mark task as complete after tool execution
         state["task_complete"] = True
 
-        if result:
-            log.info(f"Tool {tool_name} executed successfully")
-        else:
-            log.warning(f"Tool {tool_name} failed")
+        for tool_call, result in zip(tool_calls, results):
+            tool_name = tool_call["name"]
+
+            # Add tool result to messages
+            tool_result = {
+                "role": "tool",
+                "tool_call_id": tool_call.get("id", "1"),
+                "content": f"Tool {tool_name} executed with result: {result}",
+            }
+            state["messages"].append(tool_result)
+
+            if result:
+                log.info(f"Tool {tool_name} executed successfully")
+                state.setdefault("skill_steps", []).append(
+                    {"name": tool_name, "args": tool_call["args"]}
+                )
+            else:
+                log.warning(f"Tool {tool_name} failed")
+                state["tools_failed"] = True
+                if state.get("skill_replay"):
+                    # The recorded skill no longer fits the page; let the agent decide instead
+                    skill_cache.forget(state["messages"][0]["content"])
+                    state["task_complete"] = False
 
     return state
 
 
-def create_workflow() -> Any:
-    """Create and return a LangGraph workflow"""
+def create_workflow(resumable: bool = False) -> Any:
+    """
+    Create and return a LangGraph workflow
+
+    Args:
+        resumable: Checkpoint state with MemorySaver and pause before human_approval so a
+            run can be resumed; otherwise no state is checkpointed between steps
+    """
     log.debug("Building LangGraph workflow...")
 
     # Create the workflow
     workflow = StateGraph(AgentState)
 
-    # Define node functions with context handling
-    async def security_check_wrapper(state: AgentState):
-        return await security_check_node(state)
+    # Define node functions with context handling; the graph is compiled once, so each
+    # run's browser context is looked up by the task id in its config
+    async def agent_wrapper(state: AgentState, config: RunnableConfig):
+        return await agent_node(state, get_task_context(config["configurable"].get("task_id")))
 
-    async def tool_wrapper(state: AgentState):
-        return await tool_node(state)
+    async def tool_wrapper(state: AgentState, config: RunnableConfig):
+        return await tool_node(state, get_task_context(config["configurable"].get("task_id")))
 
     # Add nodes to the graph
-    workflow.add_node("security_check", security_check_wrapper)
-    workflow.add_node("agent", agent_node)
+    workflow.add_node("agent", agent_wrapper)
     workflow.add_node("tool", tool_wrapper)
 
     # Define conditional edges
-    def should_request_approval(state: AgentState) -> str:
-        """Check if human approval is needed"""
-        return "human_approval" if state.get("browser_action", "") else "agent"
-
     def should_continue_to_tool(state: AgentState) -> str:
         """Check if agent wants to use a tool"""
         last_message = state["messages"][-1]
@@ -161,24 +217,22 @@ def create_workflow() -> Any:
         return "tool" if has_tool_calls else END
 
     def should_end_workflow(state: AgentState) -> str:
-        """Check if task is complete"""
-        return END if state.get("task_complete", False) else "security_check"
+        """Check if task is complete, detouring through approval when an action pended"""
+        if state.get("task_complete", False):
+            return END
+        return "human_approval" if state.get("browser_action", "") else "agent"
 
     # Add conditional edges
-    workflow.add_conditional_edges(
-        "security_check",
-        should_request_approval,
-        {"agent": "agent", "human_approval": "human_approval"},
-    )
-
     workflow.add_conditional_edges("agent", should_continue_to_tool, {"tool": "tool", END: END})
 
     workflow.add_conditional_edges(
-        "tool", should_end_workflow, {END: END, "security_check": "security_check"}
+        "tool",
+        should_end_workflow,
+        {END: END, "agent": "agent", "human_approval": "human_approval"},
     )
 
     # Set entry point
-    workflow.set_entry_point("security_check")
+    workflow.set_entry_point("agent")
 
     # Add human approval node
     async def human_approval_node(state: AgentState) -> AgentState:
@@ -192,31 +246,39 @@ def create_workflow() -> Any:
     workflow.add_node("human_approval", human_approval_node)
     workflow.add_edge("human_approval", "agent")
 
-    # Compile the workflow
-    try:
-        memory = MemorySaver()
-        app = workflow.compile(checkpointer=memory, interrupt_before=["human_approval"])
-    except Exception as e:
-        log.warning(f"Checkpointer configuration failed: {e}, using simple compilation")
+    # Compile the workflow; interrupts need a checkpointer, so only resumable runs pause
+    if not resumable:
         app = workflow.compile()
+    else:
+        try:
+            memory = MemorySaver()
+            app = workflow.compile(checkpointer=memory, interrupt_before=["human_approval"])
+        except Exception as e:
+            log.warning(f"Checkpointer configuration failed: {e}, using simple compilation")
+            app = workflow.compile()
 
     log.info("LangGraph workflow built successfully")
     return app
 
 
-async def run_agent_workflow(
+# The graph holds no per-run state, so it is compiled once; runs are not resumed, so it
+# skips checkpointing, and each run still gets its own thread_id
+_APP = create_workflow()
+
+
+async def stream_agent_workflow(
     initial_task: str, max_iterations: int = 5, use_real_browser: bool = False
-) -> Dict[str, Any]:
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Run the browser automation agent workflow with enhanced error handling
+    Run the browser automation agent workflow, yielding state as it advances
 
     Args:
         initial_task: The task description to execute
         max_iterations: Maximum number of iterations
         use_real_browser: Whether to use real browser or mock mode
 
-    Returns:
-        Final workflow state
+    Yields:
+        Workflow state after each step; the last one is the final state
     """
     log.info(f"Starting browser agent with task: {initial_task}")
 
@@ -231,12 +293,18 @@ async def run_agent_workflow(
     state: AgentState = {
         "messages": [{"role": "user", "content": initial_task.strip()}],
         "page_map": "",
+        "page_map_dirty": True,
         "browser_action": "",
         "task_complete": False,
+        "history_summary": {"text": "", "covered": 0},
+        "skill_steps": [],
+        "skill_replay": False,
+        "tools_failed": False,
     }
 
     # Initialize browser context if needed
     browser_context: Optional[BrowserContext] = None
+    task_id = uuid.uuid4().hex
     browser_creation_attempts = 0
     max_browser_attempts = 3
 
@@ -246,6 +314,7 @@ async def run_agent_workflow(
                 log.info(
                     f"Creating browser context (attempt {browser_creation_attempts + 1}/{max_browser_attempts})..."
                 )
+                # Served from the warm pool when an idle context is ready
                 browser_context = await create_browser_context()
 
                 # Test the browser context with a simple navigation
@@ -255,6 +324,13 @@ async def run_agent_workflow(
 
             except Exception as e:
                 browser_creation_attempts += 1
+                if browser_context is not None:
+                    # Hand a context that failed its test back instead of leaking it
+                    try:
+                        await close_browser_context(browser_context)
+                    except Exception as close_error:
+                        log.debug(f"Failed to close untested browser context: {close_error}")
+                    browser_context = None
                 log.warning(
                     f"Browser context creation attempt {browser_creation_attempts} failed: {e}"
                 )
@@ -266,30 +342,49 @@ async def run_agent_workflow(
                     use_real_browser = False
                     browser_context = None
                 else:
-                    # Wait before retrying
-                    await asyncio.sleep(1 * browser_creation_attempts)
+                    # Wait before retrying, with jitter so concurrent runs do not retry in lockstep
+                    await asyncio.sleep(
+                        random.uniform(0.5, 1.0) * 2 ** (browser_creation_attempts - 1)
+                    )
 
     try:
-        # Create and run workflow with error recovery
+        # Let the graph nodes reach this run's browser context through its task id
+        if browser_context is not None:
+            cache_task_context(task_id, browser_context)
+
+        # Run the compiled workflow with error recovery; only execution is retried
+        app = _APP
         workflow_attempts = 0
         max_workflow_attempts = 2
 
         while workflow_attempts < max_workflow_attempts:
             try:
-                app = create_workflow()
-
                 # Execute the workflow
                 log.debug(
                     f"Executing workflow (attempt {workflow_attempts + 1}/{max_workflow_attempts})..."
                 )
                 config = {
-                    "configurable": {"thread_id": "default"},
+                    "configurable": {"thread_id": uuid.uuid4().hex, "task_id": task_id},
                     "recursion_limit": max_iterations,
                 }
-                final_state = await app.ainvoke(state, config=config)
+                # "values" snapshots are already fresh dicts, so they are yielded as-is
+                final_state = cast(Dict[str, Any], state)
+                async for final_state in app.astream(state, config=config, stream_mode="values"):
+                    yield final_state
+
+                # Remember what completed the task so a repeat can replay it; mock runs
+                # always succeed, so only real browser runs are recorded, and only when
+                # every call worked and the steps did not come from the cache already
+                if (
+                    use_real_browser
+                    and final_state.get("task_complete")
+                    and not final_state.get("tools_failed")
+                    and not final_state.get("skill_replay")
+                ):
+                    skill_cache.store(initial_task, final_state.get("skill_steps", []))
 
                 log.info("Workflow completed successfully")
-                return dict(final_state)
+                return
 
             except Exception as workflow_error:
                 workflow_attempts += 1
@@ -321,8 +416,8 @@ async def run_agent_workflow(
 
         log.error(f"Agent workflow failed: {error_details}")
 
-        # Return error state instead of raising
-        return {
+        # Yield error state instead of raising
+        yield {
             "messages": state["messages"],
             "page_map": state["page_map"],
             "browser_action": state["browser_action"],
@@ -332,6 +427,7 @@ async def run_agent_workflow(
 
     finally:
         # Clean up browser context with enhanced error handling
+        evict_task_context(task_id)
         if browser_context:
             cleanup_attempts = 0
             max_cleanup_attempts = 3
@@ -355,6 +451,26 @@ async def run_agent_workflow(
                         await asyncio.sleep(0.5)
 
 
+async def run_agent_workflow(
+    initial_task: str, max_iterations: int = 5, use_real_browser: bool = False
+) -> Dict[str, Any]:
+    """
+    Run the browser automation agent workflow with enhanced error handling
+
+    Args:
+        initial_task: The task description to execute
+        max_iterations: Maximum number of iterations
+        use_real_browser: Whether to use real browser or mock mode
+
+    Returns:
+        Final workflow state
+    """
+    final_state: Dict[str, Any] = {}
+    async for final_state in stream_agent_workflow(initial_task, max_iterations, use_real_browser):
+        pass
+    return final_state
+
+
 # Legacy function for backward compatibility
 def is_destructive_action(action: str) -> bool:
     """Check if an action is destructive (legacy function)"""
@@ -368,12 +484,18 @@ if __name__ == "__main__":
     print("🚀 Browser Agent")
     print("=" * 50)
 
-    # Run the agent workflow
-    asyncio.run(run_agent_workflow(example_task))
+    # Size the default executor for run_in_executor offloads; both runs share one loop
+    with asyncio.Runner() as runner:
+        runner.get_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=int(os.getenv("BROWSERFREAK_THREAD_POOL_SIZE", "64")))
+        )
+
+        # Run the agent workflow
+        runner.run(run_agent_workflow(example_task))
 
-    print("\n" + "=" * 50)
-    print("Testing destructive action detection:")
+        print("\n" + "=" * 50)
+        print("Testing destructive action detection:")
 
-    # Test destructive action
-    destructive_task = "Click the pay now button to complete purchase"
-    asyncio.run(run_agent_workflow(destructive_task))
+        # Test destructive action
+        destructive_task = "Click the pay now button to complete purchase"
+        runner.run(run_agent_workflow(destructive_task))
@@ -3,59 +3,472 @@ Browser management module for BrowserFreak
 """
 
 import asyncio
+import atexit
+import importlib.util
 import os
-from typing import Any, Dict, Optional, Tuple, Union
+import random
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
 
+import httpx
+import soupsieve
 from bs4 import BeautifulSoup
-from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+from playwright.async_api import Browser, BrowserContext, Locator, Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
 
 from .config import settings
 from .exceptions import BrowserError, BrowserTimeoutError, ElementNotFoundError
 from .logging_config import log
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional speedup; BeautifulSoup is used without it
+    LexborHTMLParser = None
+
+
+@dataclass(slots=True, frozen=True)
+class BrowserSession:
+    """Handles for one browser automation session, as returned by create_browser_context"""
+
+    playwright: Any
+    browser: Union[Browser, BrowserContext]
+    context: Optional[BrowserContext]
+    page: Page
+
+
+class BrowserContextPool:
+    """
+    Keeps one browser warm and hands out isolated browser contexts.
+
+    Launching Chromium is expensive while creating a context is cheap, so the pool
+    launches the browser once and serves at most max_contexts contexts at a time.
+    Released contexts are closed and replaced with a fresh idle one, which keeps
+    cookies and storage from leaking between tasks.
+    """
+
+    def __init__(self, max_contexts: Optional[int] = None):
+        self._max_contexts = max_contexts or settings.browser.pool_size
+        self._slots = asyncio.Semaphore(self._max_contexts)
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._in_use: Set[BrowserContext] = set()
+        self._lock = asyncio.Lock()
+        self._playwright: Any = None
+        self._browser: Optional[Browser] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._health_page: Optional[Page] = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """HTTP client for the navigation fast path, sharing connections across tasks"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=100),
+                timeout=settings.browser.page_load_timeout / 1000,
+            )
+        return self._http_client
+
+    def owns(self, context: Optional[BrowserContext]) -> bool:
+        """Check whether a context was handed out by this pool"""
+        return context is not None and context in self._in_use
+
+    async def _start_playwright(self) -> Any:
+        """Start the Playwright driver on first use; callers hold the lock"""
+        if self._playwright is None:
+            log.debug("Starting Playwright...")
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def playwright(self) -> Any:
+        """
+        Get the Playwright instance shared by the pool and persistent contexts.
+
+        Starting Playwright spawns its driver process, so one instance serves every
+        browser on this event loop and is stopped when the pool closes.
+        """
+        async with self._lock:
+            return await self._start_playwright()
+
+    async def _ensure_browser(self) -> Browser:
+        """Start Playwright and launch the browser on first use"""
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                playwright = await self._start_playwright()
+                log.info(
+                    f"Launching pooled browser (headless={settings.browser.headless}, channel={settings.browser.channel})"
+                )
+                self._browser = await playwright.chromium.launch(
+                    headless=settings.browser.headless,
+                    channel=settings.browser.channel,
+                    slow_mo=settings.browser.slow_mo,
+                )
+            return self._browser
+
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        """Create a context with the configured default timeouts"""
+        context = await browser.new_context()
+        _set_default_timeouts(context)
+        return context
+
+    async def acquire(
+        self,
+    ) -> BrowserSession:
+        """
+        Acquire a browser context, waiting if max_contexts are already in use.
+
+        Returns:
+            BrowserSession with the playwright, browser, context and page
+        """
+        browser = await self._ensure_browser()
+        await self._slots.acquire()
+
+        context: Optional[BrowserContext] = None
+        try:
+            try:
+                context = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                context = await self._new_context(browser)
+            page = context.pages[0] if context.pages else await context.new_page()
+        except Exception:
+            self._slots.release()
+            if context is not None:
+                # A context that could not open a page is dropped rather than reused
+                try:
+                    await context.close()
+                except Exception as close_error:
+                    log.debug(f"Failed to close broken browser context: {close_error}")
+            raise
+
+        self._in_use.add(context)
+        log.debug(f"Acquired pooled browser context ({len(self._in_use)}/{self._max_contexts})")
+        return BrowserSession(self._playwright, browser, context, page)
+
+    async def health_page(self) -> Page:
+        """Get the page kept open for health checks, outside the context slots"""
+        browser = await self._ensure_browser()
+        # Under the lock, so concurrent checks share one page instead of each opening a context
+        async with self._lock:
+            if self._health_page is not None and not self._health_page.is_closed():
+                return self._health_page
+
+            if self._health_page is not None:
+                await self._close_health_context()
+            context = await self._new_context(browser)
+            try:
+                self._health_page = await context.new_page()
+            except Exception:
+                await context.close()
+                raise
+            return self._health_page
+
+    async def _close_health_context(self) -> None:
+        """Close the health check page's context; callers hold the lock"""
+        if self._health_page is None:
+            return
+        context, self._health_page = self._health_page.context, None
+        try:
+            await context.close()
+        except Exception as e:
+            log.debug(f"Failed to close health check browser context: {e}")
+
+    async def warm(self, count: int = 1) -> None:
+        """
+        Launch the browser and prepare idle contexts ahead of the first acquire.
+
+        Args:
+            count: Idle contexts to have ready, capped by the free slots
+        """
+        browser = await self._ensure_browser()
+        target = min(count, self._max_contexts - len(self._in_use))
+        while self._idle.qsize() < target:
+            self._idle.put_nowait(await self._new_context(browser))
+        log.debug(f"Browser context pool warmed ({self._idle.qsize()} idle)")
+
+    async def release(
+        self,
+        context: BrowserSession,
+    ) -> None:
+        """
+        Return a context to the pool.
+
+        Args:
+            context: Session from acquire
+        """
+        context_obj = context.context
+        if context_obj is None or context_obj not in self._in_use:
+            return
+
+        self._in_use.discard(context_obj)
+        try:
+            await context_obj.close()
+            if self._browser is not None and self._browser.is_connected():
+                try:
+                    self._idle.put_nowait(await self._new_context(self._browser))
+                except Exception as e:
+                    log.warning(f"Failed to prepare replacement browser context: {e}")
+        finally:
+            self._slots.release()
+            log.debug(f"Released pooled browser context ({len(self._in_use)}/{self._max_contexts})")
+
+    async def close(self) -> None:
+        """Close all pooled contexts, the browser and Playwright"""
+        async with self._lock:
+            await self._close_health_context()
+            while not self._idle.empty():
+                await self._idle.get_nowait().close()
+            for context_obj in list(self._in_use):
+                await context_obj.close()
+            self._in_use.clear()
+
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            if self._http_client is not None:
+                await self._http_client.aclose()
+                self._http_client = None
+        log.info("Browser context pool closed")
+
+
+# Playwright objects are bound to the event loop that created them, so keep one pool per loop
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserContextPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_browser_pool() -> BrowserContextPool:
+    """Get the browser context pool for the running event loop"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = BrowserContextPool()
+    return pool
+
+
+async def warm_browser_pool(count: int = 1) -> bool:
+    """
+    Warm the browser context pool of the running event loop off the critical path.
+
+    Args:
+        count: Idle contexts to have ready
+
+    Returns:
+        True if the pool is warm, False if the browser could not be launched
+    """
+    try:
+        await get_browser_pool().warm(count)
+        return True
+    except Exception as e:
+        log.warning(f"Browser pool warmup failed: {e}")
+        return False
+
+
+async def shutdown_browser_pool() -> None:
+    """Close the browser context pool of the running event loop, if one was created"""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
+
+
+# Pages navigate_to_url fetched over HTTP only, with the (url, html) they stand for
+_deferred_pages: "weakref.WeakKeyDictionary[Page, Tuple[str, str]]" = weakref.WeakKeyDictionary()
+# Held while a deferred page loads in the browser
+_deferred_locks: "weakref.WeakKeyDictionary[Page, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+# Static pages with more scripts than this are loaded in the browser instead
+_FAST_PATH_MAX_SCRIPTS = 2
+
+# lxml is an optional speedup; html.parser is the pure-Python fallback
+_HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Elements the agent can interact with, matched in one document-order pass
+_INTERACTIVE_CSS = (
+    "button, input, select, textarea, a[href], [onclick], [role='button'], [tabindex]"
+)
+_INTERACTIVE_SELECTOR = soupsieve.compile(_INTERACTIVE_CSS)
+# lexbor yields an element once per matching selector in a list; :is() yields it once
+_INTERACTIVE_LEXBOR_CSS = f":is({_INTERACTIVE_CSS})"
+
+# Tags stripped from the HTML before it is handed to the agent
+_STRIPPED_TAGS = ["script", "style", "noscript", "meta", "link"]
+
+# Describes interactive elements in the page itself, mirroring the BeautifulSoup extraction
+_EXTRACT_ELEMENTS_JS = """
+(css) => Array.from(document.querySelectorAll(css), (el, i) => {
+    const attr = (name) => el.getAttribute(name) || "";
+    const tag = el.tagName.toLowerCase();
+    const classes = Array.from(el.classList);
+    const text = (el.textContent || "").replace(/\\s+/g, " ").trim()
+        || attr("value") || attr("placeholder");
+    let selector = tag;
+    if (el.id) selector += "#" + el.id;
+    else if (attr("name")) selector += "[name='" + attr("name") + "']";
+    else if (classes.length) selector += "." + classes.join(".");
+    return {
+        index: i + 1, selector, tag, text: text.slice(0, 100), id: el.id, name: attr("name"),
+        classes, href: attr("href"), type: attr("type"), placeholder: attr("placeholder"),
+    };
+})
+"""
+
+# Locators already built per page, bounded so long sessions do not accumulate them
+_locators: "weakref.WeakKeyDictionary[Page, Dict[str, Locator]]" = weakref.WeakKeyDictionary()
+_MAX_LOCATORS_PER_PAGE = 256
+
+# scrollBy option each direction moves along; its keys are the valid directions
+_SCROLL_PROP = {"up": "top", "down": "top", "left": "left", "right": "left"}
+
+# Scrolls the page, or the element matching args.selector, by a signed offset. An element
+# is only scrolled once visible, so polling this script both waits for it and scrolls it.
+_SCROLL_JS = """
+(args) => {
+    let target = window;
+    if (args.selector) {
+        target = document.querySelector(args.selector);
+        if (!target) return false;
+        const rect = target.getBoundingClientRect();
+        if (!rect.width || !rect.height || getComputedStyle(target).visibility === "hidden") {
+            return false;
+        }
+    }
+    target.scrollBy({ behavior: args.behavior, [args.prop]: args.amount });
+    return true;
+}
+"""
+
+# Cheap in-page fingerprint telling whether the DOM changed since the last analysis.
+# A MutationObserver installed on first use counts DOM changes; the random token tells
+# a reloaded document apart from the one the count belongs to.
+_FINGERPRINT_JS = """
+() => {
+    if (window.__bfFingerprint === undefined) {
+        const state = { token: Math.random().toString(36).slice(2), mutations: 0 };
+        new MutationObserver(() => { state.mutations += 1; }).observe(document, {
+            subtree: true,
+            childList: true,
+            attributes: true,
+            characterData: true,
+        });
+        window.__bfFingerprint = state;
+    }
+    const state = window.__bfFingerprint;
+    return [state.token, state.mutations, location.href];
+}
+"""
+
+# Last get_interactive_elements result per page, as (fingerprint, result)
+_page_analysis: "weakref.WeakKeyDictionary[Page, Tuple[Tuple[Any, ...], Dict[str, Any]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _set_default_timeouts(context: BrowserContext) -> None:
+    """Apply the configured timeouts to every page of a context, so calls need not pass them"""
+    context.set_default_timeout(settings.browser.default_timeout)
+    context.set_default_navigation_timeout(settings.browser.page_load_timeout)
+
+
+def _locator(page: Page, selector: str) -> Locator:
+    """Get the first-match locator for a selector on a page, reusing an earlier one"""
+    page_locators = _locators.get(page)
+    if page_locators is None:
+        page_locators = _locators[page] = {}
+    locator = page_locators.get(selector)
+    if locator is None:
+        if len(page_locators) >= _MAX_LOCATORS_PER_PAGE:
+            page_locators.clear()
+        # .first keeps page.click/page.fill first-match behaviour instead of strict mode
+        locator = page_locators[selector] = page.locator(selector).first
+    return locator
+
+
+async def _fetch_static_page(url: str) -> Optional[str]:
+    """Fetch a URL over HTTP, returning its body only if no browser is needed to render it"""
+    try:
+        response = await get_browser_pool().http_client.get(url)
+    except httpx.HTTPError as e:
+        log.debug(f"HTTP fast path unavailable for {url}: {e}")
+        return None
+
+    if response.status_code >= 400:
+        return None
+    body = response.text
+    if "html" in response.headers.get("content-type", ""):
+        if body.lower().count("<script") > _FAST_PATH_MAX_SCRIPTS:
+            return None
+    return body
+
+
+async def _load_deferred_page(page: Page) -> None:
+    """Load a page in the browser that navigate_to_url only fetched over HTTP"""
+    lock = _deferred_locks.get(page)
+    if page not in _deferred_pages and (lock is None or not lock.locked()):
+        return
+
+    # Concurrent callers wait for the one navigation instead of acting on a loading page
+    async with _deferred_locks.setdefault(page, asyncio.Lock()):
+        deferred = _deferred_pages.pop(page, None)
+        if deferred is not None:
+            log.debug(f"Loading {deferred[0]} in the browser for interaction")
+            await page.goto(deferred[0])
+            await page.wait_for_load_state("domcontentloaded")
+
+
+def _close_pools_at_exit() -> None:
+    """Close pools whose event loop outlived the code that used them"""
+    for loop, pool in list(_pools.items()):
+        if loop.is_closed():
+            continue
+        try:
+            if loop.is_running():
+                # A loop serving another thread, such as the UI background loop
+                asyncio.run_coroutine_threadsafe(pool.close(), loop).result(timeout=10)
+            else:
+                loop.run_until_complete(pool.close())
+        except Exception as e:
+            log.warning(f"Failed to close browser context pool at exit: {e}")
+    _pools.clear()
+
+
+atexit.register(_close_pools_at_exit)
+
 
 async def create_browser_context(
     user_data_dir: Optional[str] = None,
-) -> Tuple[Any, Union[Browser, BrowserContext], Optional[BrowserContext], Page]:
+) -> BrowserSession:
     """
     Create and return a browser context.
 
     Args:
         user_data_dir: Path to user data directory for persistent storage.
-                      If None, creates a new temporary browser context.
+                      If None, acquires a temporary context from the browser pool.
 
     Returns:
-        Tuple of (playwright, browser, context, page)
+        BrowserSession with the playwright, browser, context and page
 
     Raises:
         BrowserError: If browser creation fails
         FileNotFoundError: If user_data_dir doesn't exist
     """
     try:
-        log.debug("Starting Playwright...")
-        playwright = await async_playwright().start()
-
         if user_data_dir is None:
-            # Create a new temporary browser context
-            log.info(
-                f"Creating temporary browser context (headless={settings.browser.headless}, channel={settings.browser.channel})"
-            )
-            browser = await playwright.chromium.launch(
-                headless=settings.browser.headless,
-                channel=settings.browser.channel,
-                slow_mo=settings.browser.slow_mo,
-            )
-
-            context = await browser.new_context()
-            page = await context.new_page()
+            # Temporary contexts share the pooled browser
+            log.info("Acquiring temporary browser context from pool")
+            context = await get_browser_pool().acquire()
 
             log.info("Browser context created successfully")
-            return playwright, browser, context, page
+            return context
         else:
             # Use the specified user data directory for persistent context
             if not os.path.exists(user_data_dir):
                 raise FileNotFoundError(f"User data directory not found at: {user_data_dir}")
 
+            playwright = await get_browser_pool().playwright()
+
             log.info(
                 f"Creating persistent browser context at {user_data_dir} (headless={settings.browser.headless}, channel={settings.browser.channel})"
             )
@@ -66,9 +479,10 @@ async def create_browser_context(
                 slow_mo=settings.browser.slow_mo,
             )
 
+            _set_default_timeouts(browser)
             page = browser.pages[0]
             log.info("Persistent browser context created successfully")
-            return playwright, browser, None, page
+            return BrowserSession(playwright, browser, None, page)
 
     except Exception as e:
         log.error(f"Failed to create browser context: {e}")
@@ -76,26 +490,32 @@ async def create_browser_context(
 
 
 async def close_browser_context(
-    context: Tuple[Any, Union[Browser, BrowserContext], Optional[BrowserContext], Page],
+    context: BrowserSession,
 ) -> None:
     """
     Close the browser context and cleanup resources.
 
+    Pooled contexts are handed back to the pool and the shared browser stays open.
+
     Args:
-        context: Tuple from create_browser_context
+        context: Session from create_browser_context
     """
     try:
         log.debug("Closing browser context...")
-        playwright, browser, context_obj, _ = context
+        browser, context_obj = context.browser, context.context
+
+        pool = _pools.get(asyncio.get_running_loop())
+        if pool is not None and pool.owns(context_obj):
+            await pool.release(context)
+            log.info("Browser context returned to pool")
+            return
 
         if context_obj:
             await context_obj.close()
             log.debug("Browser context closed")
 
+        # Playwright itself is shared through the pool and stopped when it closes
         await browser.close()
-        log.debug("Browser closed")
-
-        await playwright.stop()
         log.info("Browser context cleanup completed")
 
     except Exception as e:
@@ -103,14 +523,12 @@ async def close_browser_context(
         raise BrowserError(f"Browser cleanup failed: {e}") from e
 
 
-async def navigate_to_url(
-    context: Tuple[Any, Union[Browser, BrowserContext], Optional[BrowserContext], Page], url: str
-) -> Page:
+async def navigate_to_url(context: BrowserSession, url: str) -> Page:
     """
     Navigate to the specified URL.
 
     Args:
-        context: Tuple from create_browser_context
+        context: Session from create_browser_context
         url: URL to navigate to
 
     Returns:
@@ -121,12 +539,21 @@ async def navigate_to_url(
     """
     try:
         log.info(f"Navigating to URL: {url}")
-        _, _, _, page = context
-
-        await page.goto(url, timeout=settings.browser.page_load_timeout)
-        await page.wait_for_load_state(
-            "domcontentloaded", timeout=settings.browser.page_load_timeout
-        )
+        page = context.page
+
+        if settings.browser.http_fast_path and url.startswith(("http://", "https://")):
+            body = await _fetch_static_page(url)
+            if body is not None:
+                # Reading the page needs no browser; interacting with it loads it first
+                _deferred_pages[page] = (url, body)
+                _page_analysis.pop(page, None)
+                log.info(f"Fetched {url} over HTTP, browser load deferred")
+                return page
+
+        _deferred_pages.pop(page, None)
+        _page_analysis.pop(page, None)
+        await page.goto(url)
+        await page.wait_for_load_state("domcontentloaded")
 
         log.info(f"Successfully navigated to {url}")
         return page
@@ -137,7 +564,7 @@ async def navigate_to_url(
 
 
 async def click_element(
-    context: Tuple[Any, Union[Browser, BrowserContext], Optional[BrowserContext], Page],
+    context: BrowserSession,
     selector: str,
     max_retries: int = 3,
 ) -> bool:
@@ -145,7 +572,7 @@ async def click_element(
     Click on an element matching the CSS selector with retry logic.
 
     Args:
-        context: Tuple from create_browser_context
+        context: Session from create_browser_context
         selector: CSS selector for the element to click
         max_retries: Maximum number of retry attempts
 
@@ -153,11 +580,14 @@ async def click_element(
         True if click was successful, False otherwise
 
     Raises:
-        ElementNotFoundError: If element is not found after all retries
-        BrowserTimeoutError: If element doesn't become clickable after all retries
+        BrowserTimeoutError: If element is missing or doesn't become clickable after all retries
         BrowserError: For other browser-related errors
     """
-    _, _, _, page = context
+    page = context.page
+    try:
+        await _load_deferred_page(page)
+    except Exception as e:
+        raise BrowserError(f"Navigation failed: {e}") from e
 
     for attempt in range(max_retries):
         try:
@@ -165,25 +595,10 @@ async def click_element(
                 f"Attempting to click element: {selector} (attempt {attempt + 1}/{max_retries})"
             )
 
-            # Wait for element to be visible and clickable
-            await page.wait_for_selector(
-                selector, state="visible", timeout=settings.browser.default_timeout
-            )
-
-            # Additional check: wait for element to be stable (not moving)
-            await page.wait_for_function(
-                f"""
-                () => {{
-                    const el = document.querySelector('{selector}');
-                    if (!el) return false;
-                    const rect = el.getBoundingClientRect();
-                    return rect.width > 0 && rect.height > 0;
-                }}
-                """,
-                timeout=settings.browser.default_timeout,
-            )
-
-            await page.click(selector, timeout=settings.browser.default_timeout)
+            # Locator clicks wait until the element is visible, has a non-empty box, is
+            # stable and receives events, so no separate in-page polling is needed
+            await _locator(page, selector).click()
+            _page_analysis.pop(page, None)
 
             log.info(f"Successfully clicked element: {selector}")
             return True
@@ -194,27 +609,25 @@ async def click_element(
             if attempt == max_retries - 1:
                 # Last attempt failed
                 log.error(f"Failed to click element '{selector}' after {max_retries} attempts: {e}")
-                if "Timeout" in str(e):
+                # Playwright reports a missing element as a timeout while waiting for it
+                if isinstance(e, PlaywrightTimeoutError):
                     raise BrowserTimeoutError(
                         f"Element '{selector}' not clickable within timeout after {max_retries} attempts"
                     ) from e
-                elif "not found" in str(e).lower():
-                    raise ElementNotFoundError(
-                        f"Element '{selector}' not found after {max_retries} attempts"
-                    ) from e
                 else:
                     raise BrowserError(
                         f"Click failed for element '{selector}' after {max_retries} attempts: {e}"
                     ) from e
 
-            # Wait before retrying (exponential backoff)
-            await asyncio.sleep(0.5 * (2**attempt))
+            # Wait before retrying (exponential backoff with full jitter, so concurrent
+            # retries on the same element spread out instead of firing together)
+            await asyncio.sleep(random.uniform(0, 0.5 * (2**attempt)))
 
     return False
 
 
 async def type_text(
-    context: Tuple[Any, Union[Browser, BrowserContext], Optional[BrowserContext], Page],
+    context: BrowserSession,
     selector: str,
     text: str,
 ) -> bool:
@@ -222,7 +635,7 @@ async def type_text(
     Type text into an element matching the CSS selector.
 
     Args:
-        context: Tuple from create_browser_context
+        context: Session from create_browser_context
         selector: CSS selector for the input element
         text: Text to type into the element
 
@@ -230,40 +643,36 @@ async def type_text(
         True if typing was successful, False otherwise
 
     Raises:
-        ElementNotFoundError: If element is not found
-        BrowserTimeoutError: If element doesn't become available in time
+        BrowserTimeoutError: If element is missing or doesn't become available in time
         BrowserError: For other browser-related errors
     """
     try:
         log.debug(
             f"Typing text into element '{selector}': '{text[:50]}{'...' if len(text) > 50 else ''}'"
         )
-        _, _, _, page = context
+        page = context.page
+        await _load_deferred_page(page)
 
-        # Wait for element to be visible
-        await page.wait_for_selector(
-            selector, state="visible", timeout=settings.browser.default_timeout
-        )
-        # Clear existing text and type new text
-        await page.fill(selector, text, timeout=settings.browser.default_timeout)
+        # Clear existing text and type new text; fill waits for the element to be
+        # visible and editable, so no separate wait_for_selector round trip is needed
+        await _locator(page, selector).fill(text)
+        _page_analysis.pop(page, None)
 
         log.info(f"Successfully typed text into element: {selector}")
         return True
 
     except Exception as e:
         log.error(f"Failed to type text into element '{selector}': {e}")
-        if "Timeout" in str(e):
+        if isinstance(e, PlaywrightTimeoutError):
             raise BrowserTimeoutError(
                 f"Element '{selector}' not available for typing within timeout"
             ) from e
-        elif "not found" in str(e).lower():
-            raise ElementNotFoundError(f"Element '{selector}' not found") from e
         else:
             raise BrowserError(f"Typing failed for element '{selector}': {e}") from e
 
 
 async def scroll_page(
-    context: Tuple[Any, Union[Browser, BrowserContext], Optional[BrowserContext], Page],
+    context: BrowserSession,
     direction: str = "down",
     amount: int = 500,
     element_selector: Optional[str] = None,
@@ -273,7 +682,7 @@ async def scroll_page(
     Scroll the page or a specific element in the specified direction.
 
     Args:
-        context: Tuple from create_browser_context
+        context: Session from create_browser_context
         direction: "up", "down", "left", or "right"
         amount: Pixels to scroll (positive number)
         element_selector: Optional CSS selector for element to scroll (defaults to page)
@@ -290,48 +699,30 @@ async def scroll_page(
         log.debug(
             f"Scrolling {direction} by {amount} pixels{' on element ' + element_selector if element_selector else ''}"
         )
-        _, _, _, page = context
+        page = context.page
+        await _load_deferred_page(page)
 
         # Validate direction
-        valid_directions = ["up", "down", "left", "right"]
-        if direction.lower() not in valid_directions:
-            raise ValueError(f"Invalid direction '{direction}'. Must be one of: {valid_directions}")
+        scroll_prop = _SCROLL_PROP.get(direction.lower())
+        if scroll_prop is None:
+            raise ValueError(
+                f"Invalid direction '{direction}'. Must be one of: {list(_SCROLL_PROP)}"
+            )
 
+        # Arguments are passed as data, so the script is static and selectors need no escaping
+        scroll_args = {
+            "selector": element_selector,
+            "prop": scroll_prop,
+            "amount": amount if direction.lower() in ("down", "right") else -amount,
+            "behavior": "smooth" if smooth else "auto",
+        }
         if element_selector:
-            # Scroll a specific element
-            await page.wait_for_selector(
-                element_selector, state="visible", timeout=settings.browser.default_timeout
-            )
-            scroll_js = f"""
-            (function() {{
-                const element = document.querySelector('{element_selector}');
-                if (!element) return false;
-
-                const scrollOptions = {{
-                    behavior: '{'smooth' if smooth else 'auto'}',
-                    {_get_scroll_property(direction)}: {amount}
-                }};
-
-                element.scrollBy(scrollOptions);
-                return true;
-            }})();
-            """
+            # One in-page poll waits for the element to be visible and scrolls it
+            await page.wait_for_function(_SCROLL_JS, arg=scroll_args)
+            result = True
         else:
-            # Scroll the main page
-            scroll_js = f"""
-            (function() {{
-                const scrollOptions = {{
-                    behavior: '{'smooth' if smooth else 'auto'}',
-                    {_get_scroll_property(direction)}: {amount}
-                }};
-
-                window.scrollBy(scrollOptions);
-                return true;
-            }})();
-            """
-
-        # Execute the scroll JavaScript
-        result = await page.evaluate(scroll_js)
+            result = await page.evaluate(_SCROLL_JS, scroll_args)
+        _page_analysis.pop(page, None)
         if result:
             log.info(f"Successfully scrolled {direction} by {amount} pixels")
         else:
@@ -340,7 +731,8 @@ async def scroll_page(
 
     except Exception as e:
         log.error(f"Failed to scroll {direction}: {e}")
-        if "not found" in str(e).lower():
+        # The scroll poll times out when the target element never becomes visible
+        if element_selector and isinstance(e, PlaywrightTimeoutError):
             raise ElementNotFoundError(
                 f"Element '{element_selector}' not found for scrolling"
             ) from e
@@ -348,19 +740,91 @@ async def scroll_page(
             raise BrowserError(f"Scroll failed: {e}") from e
 
 
-def _get_scroll_property(direction: str) -> str:
-    """Helper function to get the correct scroll property name."""
-    direction = direction.lower()
-    if direction in ["up", "down"]:
-        return "top"
-    elif direction in ["left", "right"]:
-        return "left"
-    else:
-        return "top"  # default to vertical scrolling
+def _element_info(
+    index: int, tag_name: str, text: str, attrs: Any, classes: List[str]
+) -> Dict[str, Any]:
+    """Describe one interactive element from its parsed tag, text and attributes"""
+    if not text:
+        text = attrs.get("value") or attrs.get("placeholder") or ""
+    element_id = attrs.get("id") or ""
+    name = attrs.get("name") or ""
+
+    # Create a more specific selector
+    selector_parts = [tag_name]
+    if element_id:
+        selector_parts.append(f"#{element_id}")
+    elif name:
+        selector_parts.append(f"[name='{name}']")
+    elif classes:
+        selector_parts.append(f".{'.'.join(classes)}")
+
+    return {
+        "index": index + 1,
+        "selector": "".join(selector_parts),
+        "tag": tag_name,
+        "text": text[:100] if text else "",  # Limit text length
+        "id": element_id,
+        "name": name,
+        "classes": classes,
+        "href": attrs.get("href") or "",
+        "type": attrs.get("type") or "",
+        "placeholder": attrs.get("placeholder") or "",
+    }
+
+
+def _analyze_html(html_content: str) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Clean page HTML and describe its interactive elements.
+
+    Uses selectolax's lexbor parser when it is installed and enabled, and
+    BeautifulSoup otherwise. Both produce the same element descriptions.
+
+    Returns:
+        Tuple of (interactive elements, cleaned HTML)
+    """
+    interactive_elements = []
+
+    if LexborHTMLParser is not None and settings.browser.fast_html_parser:
+        tree = LexborHTMLParser(html_content)
+        tree.strip_tags(_STRIPPED_TAGS)
+        cleaned_html = tree.html or ""
+
+        for index, node in enumerate(tree.css(_INTERACTIVE_LEXBOR_CSS)):
+            try:
+                attrs = node.attributes
+                text = node.text(deep=True, separator="", strip=True)
+                classes = (attrs.get("class") or "").split()
+                interactive_elements.append(_element_info(index, node.tag, text, attrs, classes))
+            except Exception as e:
+                log.warning(f"Failed to extract info from element {index}: {e}")
+        return interactive_elements, cleaned_html
+
+    # Use BeautifulSoup to clean and parse the HTML
+    soup = BeautifulSoup(html_content, _HTML_PARSER)
+
+    # Clean the output by removing scripts, styles, etc.
+    for script in soup(_STRIPPED_TAGS):
+        script.decompose()
+
+    cleaned_html = str(soup)
+
+    # Find all interactive elements; a selector list matches each element once
+    for index, element in enumerate(_INTERACTIVE_SELECTOR.select(soup)):
+        try:
+            text = element.get_text(strip=True)
+            # class is a multi-valued attribute, so BeautifulSoup returns it as a list
+            classes = cast(List[str], element.get("class") or [])
+            interactive_elements.append(
+                _element_info(index, element.name, text, element.attrs, classes)
+            )
+        except Exception as e:
+            log.warning(f"Failed to extract info from element {index}: {e}")
+    return interactive_elements, cleaned_html
 
 
 async def get_interactive_elements(
-    context: Tuple[Any, Union[Browser, BrowserContext], Optional[BrowserContext], Page],
+    context: BrowserSession,
+    include_html: bool = True,
 ) -> Dict[str, Any]:
     """
     Get information about interactive elements on the current page.
@@ -369,106 +833,52 @@ async def get_interactive_elements(
     and cleaned HTML content for processing by the agent.
 
     Args:
-        context: Tuple from create_browser_context
+        context: Session from create_browser_context
+        include_html: Also return cleaned HTML. Without it the elements are described
+                      in the page by one evaluate call, skipping HTML transfer and parsing.
 
     Returns:
         Dictionary with 'interactive_elements' and 'cleaned_html' keys
+        ('cleaned_html' is empty when include_html is False)
 
     Raises:
         BrowserError: If page analysis fails
     """
     try:
         log.debug("Analyzing interactive elements on page")
-        _, _, _, page = context
-
-        # Get the current page HTML for BeautifulSoup processing
-        html_content = await page.content()
-
-        # Use BeautifulSoup to clean and parse the HTML
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        # Clean the output by removing scripts, styles, etc.
-        for script in soup(["script", "style", "noscript", "meta", "link"]):
-            script.decompose()
-
-        cleaned_html = str(soup)
-
-        # Find all interactive elements using BeautifulSoup
-        interactive_selectors = [
-            "button",
-            "input",
-            "select",
-            "textarea",
-            "a[href]",
-            "[onclick]",
-            '[role="button"]',
-            "[tabindex]",
-        ]
-
-        elements = []
-        for selector in interactive_selectors:
-            try:
-                found_elements = soup.select(selector)
-                elements.extend(found_elements)
-            except Exception as e:
-                log.warning(f"Failed to select elements with selector '{selector}': {e}")
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_elements = []
-        for element in elements:
-            element_id = id(element)  # Use object id for uniqueness
-            if element_id not in seen:
-                seen.add(element_id)
-                unique_elements.append(element)
-
-        # Extract element information
-        interactive_elements = []
-        for index, element in enumerate(unique_elements):
-            try:
-                # Get element text content
-                text = element.get_text(strip=True)
-                if not text:
-                    text = element.get("value", "") or element.get("placeholder", "")
-
-                # Get element attributes for better identification
-                tag_name = element.name
-                element_id = element.get("id", "")
-                classes = element.get("class", [])
-                name = element.get("name", "")
-
-                # Create a more specific selector
-                selector_parts = [tag_name]
-                if element_id:
-                    selector_parts.append(f"#{element_id}")
-                elif name:
-                    selector_parts.append(f"[name='{name}']")
-                elif classes:
-                    selector_parts.append(f".{'.'.join(classes)}")
-
-                selector = "".join(selector_parts)
-
-                element_info = {
-                    "index": index + 1,
-                    "selector": selector,
-                    "tag": tag_name,
-                    "text": text[:100] if text else "",  # Limit text length
-                    "id": element_id,
-                    "name": name,
-                    "classes": classes,
-                    "href": element.get("href", ""),
-                    "type": element.get("type", ""),
-                    "placeholder": element.get("placeholder", ""),
-                }
-
-                interactive_elements.append(element_info)
+        page = context.page
 
-            except Exception as e:
-                log.warning(f"Failed to extract info from element {index}: {e}")
-                continue
+        # Reuse the previous analysis while the page is unchanged
+        deferred = _deferred_pages.get(page)
+        if deferred is not None:
+            fingerprint: Tuple[Any, ...] = (len(deferred[1]), deferred[0], "")
+        else:
+            fingerprint = tuple(await page.evaluate(_FINGERPRINT_JS))
+        cached = _page_analysis.get(page)
+        # An analysis made without HTML only serves callers that do not need it either
+        if (
+            cached is not None
+            and cached[0] == fingerprint
+            and (cached[1]["cleaned_html"] or not include_html)
+        ):
+            log.debug("Page unchanged, reusing interactive element analysis")
+            return dict(cached[1])
+
+        if not include_html and deferred is None:
+            interactive_elements = await page.evaluate(_EXTRACT_ELEMENTS_JS, _INTERACTIVE_CSS)
+            log.info(f"Found {len(interactive_elements)} interactive elements on page")
+            result = {"interactive_elements": interactive_elements, "cleaned_html": ""}
+            _page_analysis[page] = (fingerprint, result)
+            return dict(result)
+
+        # Get the current page HTML for parsing
+        html_content = deferred[1] if deferred is not None else await page.content()
+        interactive_elements, cleaned_html = _analyze_html(html_content)
 
         log.info(f"Found {len(interactive_elements)} interactive elements on page")
-        return {"interactive_elements": interactive_elements, "cleaned_html": cleaned_html}
+        result = {"interactive_elements": interactive_elements, "cleaned_html": cleaned_html}
+        _page_analysis[page] = (fingerprint, result)
+        return dict(result)
 
     except Exception as e:
         log.error(f"Failed to get interactive elements: {e}")
@@ -491,24 +901,21 @@ async def health_check() -> Dict[str, Any]:
     }
 
     try:
-        # Check if we can create a browser context
+        # Check that the pooled browser is up; its health page stays open between checks
+        # and does not take a context slot, so busy agents cannot block the check
         log.debug("Performing browser manager health check")
         start_time = asyncio.get_event_loop().time()
 
-        context = await create_browser_context()
+        page = await get_browser_pool().health_page()
         health_status["checks"]["browser_creation"] = "pass"
 
         # Try to navigate to a simple page
         try:
-            await navigate_to_url(context, "about:blank")
+            await page.goto("about:blank")
             health_status["checks"]["navigation"] = "pass"
         except Exception as e:
             health_status["checks"]["navigation"] = f"fail: {str(e)}"
 
-        # Clean up
-        await close_browser_context(context)
-        health_status["checks"]["browser_cleanup"] = "pass"
-
         end_time = asyncio.get_event_loop().time()
         health_status["response_time"] = round(end_time - start_time, 2)
 
@@ -542,7 +949,7 @@ async def main():
         await navigate_to_url(context, "https://example.com/")
 
         # Example: Get interactive elements
-        elements = await get_interactive_elements(context)
+        elements = await get_interactive_elements(context, include_html=False)
         log.info(f"Found {len(elements['interactive_elements'])} interactive elements")
 
         # Keep browser open for inspection
@@ -551,6 +958,7 @@ async def main():
     finally:
         # Clean up browser resources
         await close_browser_context(context)
+        await shutdown_browser_pool()
 
 
 if __name__ == "__main__":
@@ -4,15 +4,42 @@ Command-line interface for BrowserFreak
 
 import asyncio
 import sys
-from typing import Optional
+from typing import Any, Callable, Coroutine, Optional, TypeVar
 
 import click
 
-from .browser_agent import run_agent_workflow
-from .browser_manager import health_check
-from .config import settings
+# The agent and browser modules pull in LangGraph, Anthropic and Playwright, so the
+# commands that use them import them on demand to keep --help and config fast; settings
+# are loaded by the commands too, so importing the CLI reads no .env
+from .config import get_settings
 from .logging_config import log
 
+try:
+    # uvloop is optional and unavailable on Windows
+    import uvloop
+
+    _new_event_loop: Callable[[], asyncio.AbstractEventLoop] = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+T = TypeVar("T")
+
+
+async def _run_with_pool(coro: Coroutine[Any, Any, T]) -> T:
+    """Await a coroutine, then close the browser pool before the event loop exits"""
+    from .browser_manager import shutdown_browser_pool
+
+    try:
+        return await coro
+    finally:
+        await shutdown_browser_pool()
+
+
+def _run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on a new event loop, uvloop's when installed, closing the pool at the end"""
+    with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+        return runner.run(_run_with_pool(coro))
+
 
 @click.group()
 @click.option("--log-level", default=None, help="Set logging level (DEBUG, INFO, WARNING, ERROR)")
@@ -22,7 +49,7 @@ def cli(log_level: Optional[str], config: Optional[str]):
 
     # Configure logging level if specified
     if log_level:
-        settings.agent.log_level = log_level.upper()
+        get_settings().agent.log_level = log_level.upper()
 
     # Re-initialize logging with new level
     from .logging_config import setup_logging
@@ -38,6 +65,7 @@ def cli(log_level: Optional[str], config: Optional[str]):
 )
 def run(task: str, real_browser: bool, max_iterations: Optional[int]):
     """Run a browser automation task"""
+    settings = get_settings()
 
     if max_iterations:
         settings.agent.max_iterations = max_iterations
@@ -50,8 +78,10 @@ def run(task: str, real_browser: bool, max_iterations: Optional[int]):
         f"Configuration: real_browser={settings.agent.use_real_browser}, max_iterations={settings.agent.max_iterations}"
     )
 
+    from .browser_agent import run_agent_workflow
+
     try:
-        result = asyncio.run(
+        result = _run(
             run_agent_workflow(
                 task,
                 max_iterations=settings.agent.max_iterations,
@@ -77,8 +107,10 @@ def health():
 
     log.info("Running health check...")
 
+    from .browser_manager import health_check
+
     try:
-        health_status = asyncio.run(health_check())
+        health_status = _run(health_check())
 
         click.echo(f"Service: {health_status['service']}")
         click.echo(f"Status: {health_status['status']}")
@@ -117,7 +149,7 @@ def server(host: str, port: int, reload: bool):
             host=host,
             port=port,
             reload=reload,
-            log_level=settings.agent.log_level.lower(),
+            log_level=get_settings().agent.log_level.lower(),
         )
     except ImportError:
         click.secho(
@@ -133,6 +165,7 @@ def server(host: str, port: int, reload: bool):
 @cli.command()
 def config():
     """Show current configuration"""
+    settings = get_settings()
 
     click.echo("BrowserFreak Configuration:")
     click.echo("=" * 40)
@@ -2,7 +2,9 @@
 Configuration management for BrowserFreak
 """
 
-from typing import Optional
+import dataclasses
+import functools
+from typing import Any, Optional, Type
 
 from pydantic import BaseModel, ConfigDict, Field, SecretStr, field_validator
 
@@ -20,6 +22,15 @@ class BrowserConfig(BaseModel):
     )
     page_load_timeout: int = Field(default=30000, description="Page load timeout (ms)")
     slow_mo: int = Field(default=0, description="Slow down operations by specified milliseconds")
+    pool_size: int = Field(default=4, description="Maximum browser contexts handed out by the pool")
+    http_fast_path: bool = Field(
+        default=False,
+        description="Fetch mostly static pages over HTTP and load them in the browser only when interacting",
+    )
+    fast_html_parser: bool = Field(
+        default=True,
+        description="Parse page HTML with selectolax when it is installed instead of BeautifulSoup",
+    )
 
 
 class AgentConfig(BaseModel):
@@ -33,7 +44,14 @@ class AgentConfig(BaseModel):
         default=True, description="Enable security checks for destructive actions"
     )
     enable_logging: bool = Field(default=True, description="Enable detailed logging")
+    enable_skill_cache: bool = Field(
+        default=True,
+        description="Replay the tool calls that completed the same task before instead of deciding again",
+    )
     log_level: str = Field(default="INFO", description="Logging level")
+    max_concurrent_tasks: int = Field(
+        default=4, description="Tasks the API server runs at once; the rest wait in its queue"
+    )
 
 
 class AnthropicConfig(BaseModel):
@@ -44,6 +62,22 @@ class AnthropicConfig(BaseModel):
     temperature: float = Field(default=0.0, description="Temperature for API calls")
     max_tokens: int = Field(default=4096, description="Maximum tokens for API responses")
     timeout: int = Field(default=60, description="API request timeout (seconds)")
+    batch_poll_interval: float = Field(
+        default=10.0, description="Polling interval for Message Batches results (seconds)"
+    )
+    batch_timeout: float = Field(
+        default=600.0,
+        description="Longest wait for a Message Batch before it is cancelled (seconds)",
+    )
+    compact_threshold: int = Field(
+        default=12, description="History length above which older messages are summarized"
+    )
+    compact_keep: int = Field(
+        default=8, description="Most recent messages sent verbatim alongside the summary"
+    )
+    compact_delta: int = Field(
+        default=4, description="New messages needed past the summary before resummarizing"
+    )
 
     @field_validator("api_key", mode="before")
     @classmethod
@@ -67,6 +101,9 @@ class UIConfig(BaseModel):
     page_icon: str = Field(default="🤖", description="Streamlit page icon")
     layout: str = Field(default="wide", description="Streamlit layout")
     sidebar_state: str = Field(default="auto", description="Sidebar initial state")
+    max_visible_messages: int = Field(
+        default=50, description="Most recent chat messages rendered on each rerun"
+    )
 
 
 class Settings(BaseModel):
@@ -89,8 +126,41 @@ class Settings(BaseModel):
         load_dotenv()
 
         # Create settings from environment
-        return cls()
+        settings = cls()
+
+        # Sections that are only read are frozen after validation, since their
+        # attributes are read on every browser action. The CLI overrides agent
+        # options, so that section stays a model.
+        for name in ("browser", "anthropic", "ui"):
+            setattr(settings, name, _freeze(getattr(settings, name)))
+        return settings
+
+
+@functools.cache
+def _frozen_type(model: Type[BaseModel]) -> type:
+    """Build a frozen slots dataclass with the same fields and properties as a config model"""
+    return dataclasses.make_dataclass(
+        model.__name__.replace("Config", "Settings"),
+        [(name, field.annotation) for name, field in model.model_fields.items()],
+        namespace={k: v for k, v in vars(model).items() if isinstance(v, property)},
+        frozen=True,
+        slots=True,
+    )
+
+
+def _freeze(config: BaseModel) -> Any:
+    """Copy a validated config model into its frozen dataclass mirror"""
+    return _frozen_type(type(config))(**dict(config))
+
+
+@functools.cache
+def get_settings() -> Settings:
+    """Get the global settings instance, loading it on first use"""
+    return Settings.from_env()
 
 
-# Global settings instance
-settings = Settings.from_env()
+def __getattr__(name: str) -> Any:
+    # Resolve ``settings`` lazily so importing this module does no .env I/O
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,8 +2,9 @@
 Decision engine for BrowserFreak - handles AI and fallback decision making
 """
 
+import asyncio
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .anthropic_client import anthropic_client
 from .exceptions import ValidationError
@@ -39,6 +40,12 @@ class DecisionEngine:
                 r"\b(scroll|move.*down|move.*up|go.*down|go.*up|page.*down|page.*up)\b",
                 re.IGNORECASE,
             ),
+            # Typed text after the verb, quoted or bare, up to "into"/"in"
+            "text_extract": re.compile(
+                r'\b(type|enter|fill)\s+["\']?([^"\']+?)["\']?\s+(?:into|in)\b', re.IGNORECASE
+            ),
+            "scroll_amount": re.compile(r"\b(\d+)\s*(pixels?|px)\b", re.IGNORECASE),
+            "scroll_dir": re.compile(r"\b(up|down|left|right)\b", re.IGNORECASE),
             "website_mention": re.compile(
                 r"\b(amazon|google|youtube|facebook|twitter|netflix|ebay|reddit|linkedin|instagram|wikipedia|github|stackoverflow|microsoft|apple)\b",
                 re.IGNORECASE,
@@ -47,14 +54,11 @@ class DecisionEngine:
 
     def _validate_messages(self, messages: List[Dict[str, Any]]) -> None:
         """Validate message structure"""
-        if not messages:
-            raise ValidationError("Messages list cannot be empty")
-
         if not isinstance(messages, list):
             raise ValidationError("Messages must be a list")
 
-        if len(messages) == 0:
-            raise ValidationError("At least one message is required")
+        if not messages:
+            raise ValidationError("Messages list cannot be empty")
 
         last_message = messages[-1]
         if not isinstance(last_message, dict) or "content" not in last_message:
@@ -68,7 +72,10 @@ class DecisionEngine:
             raise ValidationError("Empty message received. Please provide a valid instruction.")
 
     async def make_decision(
-        self, messages: List[Dict[str, Any]], page_context: str
+        self,
+        messages: List[Dict[str, Any]],
+        page_context: str,
+        history_summary: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Make a decision using AI or fallback logic
@@ -76,18 +83,29 @@ class DecisionEngine:
         Args:
             messages: Conversation history
             page_context: Current page context
+            history_summary: Per-run summary state used to compact long histories
 
         Returns:
             Decision result with tool_calls or content
         """
         # Validate input
         self._validate_messages(messages)
+        return await self._decide(messages, page_context, history_summary)
 
+    async def _decide(
+        self,
+        messages: List[Dict[str, Any]],
+        page_context: str,
+        history_summary: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Make a decision for messages that have already been validated"""
         # Try AI decision first
         if anthropic_client.is_available:
             try:
                 log.debug("Using Anthropic API for decision making")
-                return await anthropic_client.make_decision(messages, page_context, self._tools)
+                return await anthropic_client.make_decision(
+                    messages, page_context, self._tools, history_summary
+                )
             except Exception as e:
                 log.warning(
                     f"Anthropic API failed, falling back to functional decision making: {e}"
@@ -97,6 +115,74 @@ class DecisionEngine:
         log.debug("Using fallback functional decision making")
         return await self._make_fallback_decision(messages, page_context)
 
+    async def batch_decide(
+        self,
+        prompts: Sequence[Tuple[List[Dict[str, Any]], str]],
+        *,
+        max_concurrency: int = 10,
+        use_batch_api: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Make decisions for several independent prompts
+
+        Args:
+            prompts: (messages, page_context) pairs, one per decision
+            max_concurrency: Maximum decisions in flight when not using the batch API
+            use_batch_api: Submit through Anthropic's Message Batches API when available
+
+        Returns:
+            Decision results in the same order as prompts
+        """
+        if max_concurrency < 1:
+            raise ValidationError("max_concurrency must be at least 1")
+
+        prompts = list(prompts)
+        for messages, _ in prompts:
+            self._validate_messages(messages)
+
+        if use_batch_api and anthropic_client.is_available:
+            try:
+                log.debug(f"Using Anthropic Message Batches API for {len(prompts)} decisions")
+                batch_results = await anthropic_client.make_batch_decisions(prompts, self._tools)
+
+                decisions = []
+                for decision, (messages, page_context) in zip(batch_results, prompts):
+                    if decision is None:
+                        decision = await self._make_fallback_decision(messages, page_context)
+                    decisions.append(decision)
+                return decisions
+            except Exception as e:
+                log.warning(
+                    f"Anthropic batch API failed, falling back to concurrent decisions: {e}"
+                )
+
+        if anthropic_client.is_available:
+            try:
+                log.debug(f"Using Anthropic API for {len(prompts)} concurrent decisions")
+                ai_results = await anthropic_client.make_decisions(
+                    list(prompts), self._tools, max_concurrency=max_concurrency
+                )
+
+                decisions = []
+                for decision, (messages, page_context) in zip(ai_results, prompts):
+                    if decision is None:
+                        decision = await self._make_fallback_decision(messages, page_context)
+                    decisions.append(decision)
+                return decisions
+            except Exception as e:
+                log.warning(
+                    f"Anthropic API failed, falling back to functional decision making: {e}"
+                )
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def decide(messages: List[Dict[str, Any]], page_context: str) -> Dict[str, Any]:
+            async with semaphore:
+                # Already validated above, so skip make_decision's second pass
+                return await self._decide(messages, page_context)
+
+        return list(await asyncio.gather(*(decide(m, p) for m, p in prompts)))
+
     async def _make_fallback_decision(
         self, messages: List[Dict[str, Any]], page_context: str
     ) -> Dict[str, Any]:
@@ -104,20 +190,24 @@ class DecisionEngine:
         last_message = messages[-1]
         content = last_message["content"].strip().lower()
 
-        # Get original user message for website detection
-        original_user_message = None
-        for message in messages:
-            if message.get("role") == "user":
-                original_user_message = message["content"].strip()
-                break
+        # Get original user message for website detection, stopping at the first match
+        original_user_message = next(
+            (message["content"].strip() for message in messages if message.get("role") == "user"),
+            None,
+        )
 
-        # Analyze page context
-        page_has_forms = "form" in page_context.lower() if page_context else False
-        page_has_inputs = "input" in page_context.lower() if page_context else False
-        page_has_buttons = "button" in page_context.lower() if page_context else False
+        # Analyze page context, lowercasing the possibly large page HTML only once
+        page_lower = page_context.lower() if page_context else ""
+        page_has_forms = "form" in page_lower
+        page_has_inputs = "input" in page_lower
+        page_has_buttons = "button" in page_lower
 
+        # Pass values as arguments so the message is only formatted when DEBUG is enabled
         log.debug(
-            f"Page analysis - Forms: {page_has_forms}, Inputs: {page_has_inputs}, Buttons: {page_has_buttons}"
+            "Page analysis - Forms: {}, Inputs: {}, Buttons: {}",
+            page_has_forms,
+            page_has_inputs,
+            page_has_buttons,
         )
 
         # Check for website mentions in original message
@@ -125,7 +215,7 @@ class DecisionEngine:
             website_match = self._patterns["website_mention"].search(original_user_message)
             if website_match:
                 website_name = website_match.group(0)
-                log.debug(f"Detected website mention: {website_name}")
+                log.debug("Detected website mention: {}", website_name)
                 return {
                     "tool_calls": [
                         {"name": "navigate_to_website", "args": {"website_name": website_name}}
@@ -152,9 +242,7 @@ class DecisionEngine:
             text_to_input = "test data"
 
             # Extract text from message
-            text_match = re.search(
-                r'(type|enter|fill).*["\']?(.*?)["\']?.*(into|in)', content, re.IGNORECASE
-            )
+            text_match = self._patterns["text_extract"].search(content)
             if text_match and len(text_match.groups()) > 1:
                 text_to_input = text_match.group(2) or "test data"
 
@@ -169,20 +257,14 @@ class DecisionEngine:
 
         elif self._patterns["scroll_action"].search(content):
             log.debug("Detected scroll action request")
-            direction = "down"
             amount = 500
 
-            if "up" in content:
-                direction = "up"
-            elif "down" in content:
-                direction = "down"
-            elif "left" in content:
-                direction = "left"
-            elif "right" in content:
-                direction = "right"
+            # The first direction word in the message wins; content is already lowercase
+            direction_match = self._patterns["scroll_dir"].search(content)
+            direction = direction_match.group(1) if direction_match else "down"
 
             # Extract amount
-            amount_match = re.search(r"\b(\d+)\s*(pixels?|px)\b", content, re.IGNORECASE)
+            amount_match = self._patterns["scroll_amount"].search(content)
             if amount_match:
                 amount = int(amount_match.group(1))
 
@@ -198,23 +280,12 @@ class DecisionEngine:
             log.debug("Detected navigation/search request - suggesting page analysis first")
             return {"tool_calls": [{"name": "get_page_state", "args": {}}]}
 
-        elif self._patterns["website_mention"].search(content):
-            website_match = self._patterns["website_mention"].search(content)
-            if website_match:
-                website_name = website_match.group(0)
-                log.debug(f"Detected website mention: {website_name}")
-                return {
-                    "tool_calls": [
-                        {"name": "navigate_to_website", "args": {"website_name": website_name}}
-                    ]
-                }
-
-        # Check original content for website mentions
-        original_content = last_message["content"].strip()
-        website_match = self._patterns["website_mention"].search(original_content)
+        # Check the last message for website mentions; the pattern ignores case, so one
+        # search of the lowercased content also covers the original text
+        website_match = self._patterns["website_mention"].search(content)
         if website_match:
             website_name = website_match.group(0)
-            log.debug(f"Detected website mention in original content: {website_name}")
+            log.debug("Detected website mention: {}", website_name)
             return {
                 "tool_calls": [
                     {"name": "navigate_to_website", "args": {"website_name": website_name}}
@@ -240,9 +311,10 @@ class DecisionEngine:
             " Please provide more specific instructions or say 'finish' to complete the task."
         )
 
-        log.debug(f"Default response: {response}")
+        log.debug("Default response: {}", response)
         return {"content": response}
 
 
 # Global decision engine instance
 decision_engine = DecisionEngine()
+batch_decide = decision_engine.batch_decide
@@ -4,20 +4,27 @@ Logging configuration for BrowserFreak
 
 import sys
 from pathlib import Path
+from typing import Any
 
 from loguru import logger
 
-from .config import settings
+from .config import get_settings
+
+_configured = False
 
 
 def setup_logging():
     """Configure logging for the application"""
+    global _configured
+    _configured = True
 
     # Remove default handler
     logger.remove()
 
     # Determine log level
-    log_level = settings.agent.log_level.upper()
+    log_level = get_settings().agent.log_level.upper()
+    # Frame-walking tracebacks are only worth their cost while debugging
+    debug = log_level == "DEBUG"
 
     # Console handler with color
     logger.add(
@@ -25,8 +32,9 @@ def setup_logging():
         level=log_level,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         colorize=True,
-        backtrace=True,
-        diagnose=True,
+        backtrace=debug,
+        diagnose=debug,
+        enqueue=True,
     )
 
     # File handler for errors and above
@@ -40,21 +48,40 @@ def setup_logging():
         rotation="10 MB",
         retention="1 week",
         encoding="utf-8",
+        backtrace=debug,
+        diagnose=debug,
+        enqueue=True,
     )
 
-    # File handler for all logs
-    logger.add(
-        log_file.with_suffix(".debug.log"),
-        level="DEBUG",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        rotation="50 MB",
-        retention="3 days",
-        encoding="utf-8",
-    )
+    # File handler for all logs, only kept when debugging
+    if debug:
+        logger.add(
+            log_file.with_suffix(".debug.log"),
+            level="DEBUG",
+            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+            rotation="50 MB",
+            retention="3 days",
+            encoding="utf-8",
+            backtrace=True,
+            diagnose=True,
+            enqueue=True,
+        )
 
     logger.info("Logging configured successfully")
     return logger
 
 
+class _LazyLogger:
+    """Logger proxy that configures sinks the first time it is used"""
+
+    def __getattr__(self, name: str) -> Any:
+        if not _configured:
+            setup_logging()
+        value = getattr(logger, name)
+        # Cache on the proxy so later lookups skip __getattr__
+        setattr(self, name, value)
+        return value
+
+
 # Global logger instance
-log = setup_logging()
+log: Any = _LazyLogger()
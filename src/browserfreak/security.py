@@ -2,29 +2,84 @@
 Security module for BrowserFreak - handles destructive action detection and approval
 """
 
-from typing import Any, Dict
+import re
+from typing import Any, Callable, Dict, Iterable
 
 from .config import settings
 
 
+def _keyword_pattern(keywords: Iterable[str]) -> re.Pattern:
+    """Compile keywords into one case-insensitive alternation matched anywhere in the text"""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+
+
+_DESTRUCTIVE_KEYWORDS = (
+    "pay",
+    "delete",
+    "checkout",
+    "purchase",
+    "buy",
+    "submit payment",
+    "confirm order",
+    "transfer",
+    "send money",
+    "authorize payment",
+    "complete transaction",
+    "finalize purchase",
+)
+_DESTRUCTIVE_RE = _keyword_pattern(_DESTRUCTIVE_KEYWORDS)
+
+# Selector and typed-text keywords that need approval for click_element and type_text
+_PAYMENT_SELECTOR_RE = _keyword_pattern(("pay", "checkout", "purchase", "submit"))
+_SENSITIVE_TEXT_RE = _keyword_pattern(("password", "credit", "card", "ssn", "social"))
+
+
 class SecurityManager:
     """Manages security checks for browser automation actions"""
 
     def __init__(self):
-        self._destructive_keywords = [
-            "pay",
-            "delete",
-            "checkout",
-            "purchase",
-            "buy",
-            "submit payment",
-            "confirm order",
-            "transfer",
-            "send money",
-            "authorize payment",
-            "complete transaction",
-            "finalize purchase",
-        ]
+        self._destructive_re = _DESTRUCTIVE_RE
+
+        # Per-tool approval checks and messages, looked up by tool name
+        self._approval_checks: Dict[str, Callable[[Dict[str, Any]], bool]] = {
+            "click_element": self._check_click,
+            "type_text": self._check_type,
+        }
+        self._approval_messages: Dict[str, Callable[[Dict[str, Any]], str]] = {
+            "click_element": self._click_message,
+            "type_text": self._type_message,
+            "navigate_to_website": self._navigate_message,
+            "navigate_and_snapshot": self._navigate_message,
+        }
+
+    @staticmethod
+    def _check_click(tool_args: Dict[str, Any]) -> bool:
+        """Check for payment-related selectors"""
+        return _PAYMENT_SELECTOR_RE.search(tool_args.get("selector", "")) is not None
+
+    @staticmethod
+    def _check_type(tool_args: Dict[str, Any]) -> bool:
+        """Check for sensitive information in typed text"""
+        return _SENSITIVE_TEXT_RE.search(tool_args.get("text", "")) is not None
+
+    @staticmethod
+    def _click_message(tool_args: Dict[str, Any]) -> str:
+        """Describe a click for approval"""
+        selector = tool_args.get("selector", "unknown element")
+        return f"Click on element: {selector}"
+
+    @staticmethod
+    def _type_message(tool_args: Dict[str, Any]) -> str:
+        """Describe typed text for approval"""
+        selector = tool_args.get("selector", "unknown field")
+        text_preview = tool_args.get("text", "")[:50]
+        return f"Type text into {selector}: '{text_preview}...'"
+
+    @staticmethod
+    def _navigate_message(tool_args: Dict[str, Any]) -> str:
+        """Describe a navigation for approval"""
+        website = tool_args.get("website_name", "unknown website")
+        return f"Navigate to website: {website}"
 
     def is_destructive_action(self, action_description: str) -> bool:
         """
@@ -39,8 +94,7 @@ class SecurityManager:
         if not settings.agent.enable_security_checks:
             return False
 
-        action_lower = action_description.lower()
-        return any(keyword in action_lower for keyword in self._destructive_keywords)
+        return self._destructive_re.search(action_description) is not None
 
     def should_require_approval(self, tool_name: str, tool_args: Dict[str, Any]) -> bool:
         """
@@ -57,21 +111,17 @@ class SecurityManager:
             return False
 
         # Check tool-specific destructive actions
-        if tool_name == "click_element":
-            selector = tool_args.get("selector", "").lower()
-            # Check for payment-related selectors
-            if any(keyword in selector for keyword in ["pay", "checkout", "purchase", "submit"]):
-                return True
-
-        elif tool_name == "type_text":
-            text = tool_args.get("text", "").lower()
-            # Check for sensitive information
-            if any(keyword in text for keyword in ["password", "credit", "card", "ssn", "social"]):
-                return True
-
-        # Check action description
-        action_description = f"{tool_name} {str(tool_args)}"
-        return self.is_destructive_action(action_description)
+        check = self._approval_checks.get(tool_name)
+        if check is not None and check(tool_args):
+            return True
+
+        # Check the tool name and argument values, without formatting the whole dict
+        if self._destructive_re.search(tool_name):
+            return True
+        return any(
+            self._destructive_re.search(value if isinstance(value, str) else str(value))
+            for value in tool_args.values()
+        )
 
     def get_approval_message(self, tool_name: str, tool_args: Dict[str, Any]) -> str:
         """
@@ -84,18 +134,10 @@ class SecurityManager:
         Returns:
             Approval message for human review
         """
-        if tool_name == "click_element":
-            selector = tool_args.get("selector", "unknown element")
-            return f"Click on element: {selector}"
-        elif tool_name == "type_text":
-            selector = tool_args.get("selector", "unknown field")
-            text_preview = tool_args.get("text", "")[:50]
-            return f"Type text into {selector}: '{text_preview}...'"
-        elif tool_name == "navigate_to_website":
-            website = tool_args.get("website_name", "unknown website")
-            return f"Navigate to website: {website}"
-        else:
-            return f"Execute {tool_name} with args: {tool_args}"
+        build_message = self._approval_messages.get(tool_name)
+        if build_message is not None:
+            return build_message(tool_args)
+        return f"Execute {tool_name} with args: {tool_args}"
 
 
 # Global security manager instance
@@ -2,17 +2,21 @@
 FastAPI server for BrowserFreak - REST API for browser automation
 """
 
-import uuid
+import asyncio
+import secrets
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 from typing import Any, Dict, List, Optional
 
-from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, field_validator
 
 from .browser_agent import run_agent_workflow
-from .browser_manager import health_check
+from .browser_manager import health_check, shutdown_browser_pool
 from .config import settings
 from .exceptions import BrowserFreakError, ValidationError
 from .logging_config import log
@@ -35,8 +39,94 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@dataclass(slots=True)
+class TaskRecord:
+    """In-memory state of one task, with its logs kept as parallel lists"""
+
+    task_id: str
+    task_description: str
+    status: str = "queued"
+    created_at: datetime = field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    log_timestamps: List[str] = field(default_factory=list)
+    log_types: List[str] = field(default_factory=list)
+    log_messages: List[str] = field(default_factory=list)
+
+    def add_log(self, log_type: str, message: str, timestamp: Optional[datetime] = None) -> None:
+        """Append a log entry stamped with the given time, or the current time"""
+        self.log_timestamps.append((timestamp or datetime.now()).isoformat())
+        self.log_types.append(log_type)
+        self.log_messages.append(message)
+
+    def to_dict(self, legacy: bool = False) -> Dict[str, Any]:
+        """
+        Get the task in its API shape
+
+        Args:
+            legacy: Rebuild the logs as a list of entries instead of parallel arrays
+
+        Returns:
+            Task fields with the logs in the requested layout
+        """
+        task = {
+            "task_id": self.task_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "task_description": self.task_description,
+            "result": self.result,
+            "error": self.error,
+        }
+        if legacy:
+            task["logs"] = [
+                {"timestamp": timestamp, "type": log_type, "message": message}
+                for timestamp, log_type, message in zip(
+                    self.log_timestamps, self.log_types, self.log_messages
+                )
+            ]
+        else:
+            task["log_timestamps"] = self.log_timestamps
+            task["log_types"] = self.log_types
+            task["log_messages"] = self.log_messages
+        return task
+
+
 # In-memory task storage (use Redis/database for production)
-task_store: Dict[str, Dict[str, Any]] = {}
+task_store: Dict[str, TaskRecord] = {}
+
+# Task IDs per status, in the order tasks entered that status, so listing by status
+# does not scan every task
+task_index_by_status: Dict[str, Dict[str, None]] = defaultdict(dict)
+
+
+def _set_task_status(task: TaskRecord, status: str) -> None:
+    """Change a task's status and keep task_index_by_status in step"""
+    task_index_by_status[task.status].pop(task.task_id, None)
+    task.status = status
+    task_index_by_status[status][task.task_id] = None
+
+
+# Tasks waiting for a worker; create_task rejects new tasks once it is full
+task_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+
+
+async def _worker(queue: asyncio.Queue) -> None:
+    """Run queued tasks one at a time until cancelled, skipping tasks cancelled while queued"""
+    while True:
+        args = await queue.get()
+        try:
+            task = task_store[args[0]]
+            if task.status == "cancelled":
+                log.info(f"Skipping task {task.task_id}, cancelled before it started")
+                continue
+            _set_task_status(task, "running")
+            task.add_log("info", "Task started")
+            await execute_task_background(*args)
+        finally:
+            queue.task_done()
 
 
 class TaskRequest(BaseModel):
@@ -77,6 +167,10 @@ class TaskStatus(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime] = None
     result: Optional[Dict[str, Any]] = None
+    log_timestamps: List[str] = []
+    log_types: List[str] = []
+    log_messages: List[str] = []
+    # Only filled for ?legacy=1 requests
     logs: List[Dict[str, Any]] = []
     error: Optional[str] = None
 
@@ -99,28 +193,26 @@ async def health_endpoint():
 
 
 @app.post("/tasks", response_model=TaskResponse)
-async def create_task(
-    task_request: TaskRequest, background_tasks: BackgroundTasks, request: Request
-):
+async def create_task(task_request: TaskRequest, request: Request):
     """Create and execute a browser automation task"""
+    if task_queue.full():
+        raise HTTPException(status_code=503, detail="Too many queued tasks, try again later")
+
     try:
         # Validate input
         if not task_request.task.strip():
             raise ValidationError("Task description cannot be empty")
 
         # Generate task ID
-        task_id = str(uuid.uuid4())
+        task_id = secrets.token_hex(16)
 
         # Store initial task state
-        task_store[task_id] = {
-            "task_id": task_id,
-            "status": "running",
-            "created_at": datetime.now(),
-            "task_description": task_request.task,
-            "logs": [],
-            "result": None,
-            "error": None,
-        }
+        # One timestamp serves the creation time and the first log entry
+        now = datetime.now()
+        task_store[task_id] = TaskRecord(
+            task_id=task_id, task_description=task_request.task, created_at=now
+        )
+        task_index_by_status["queued"][task_id] = None
 
         # Override settings if provided
         use_real_browser = (
@@ -140,27 +232,16 @@ async def create_task(
         )
 
         # Add initial log entry
-        task_store[task_id]["logs"].append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "type": "info",
-                "message": f"Task created: {task_request.task[:100]}...",
-            }
-        )
+        task_store[task_id].add_log("info", f"Task created: {task_request.task[:100]}...", now)
 
-        # Execute task in background
-        background_tasks.add_task(
-            execute_task_background,
-            task_id,
-            task_request.task,
-            use_real_browser,
-            max_iterations,
-            enable_security,
+        # Queue the task for the next free worker
+        task_queue.put_nowait(
+            (task_id, task_request.task, use_real_browser, max_iterations, enable_security)
         )
 
         log.info(f"Task {task_id} created and queued for execution")
         return TaskResponse(
-            task_id=task_id, status="running", message="Task created and execution started"
+            task_id=task_id, status="queued", message="Task created and queued for execution"
         )
 
     except ValidationError as e:
@@ -171,27 +252,30 @@ async def create_task(
 
 
 @app.get("/tasks/{task_id}", response_model=TaskStatus)
-async def get_task_status(task_id: str):
-    """Get the status of a task"""
+async def get_task_status(task_id: str, legacy: bool = False):
+    """Get the status of a task, with its logs as parallel arrays unless legacy is set"""
     if task_id not in task_store:
         raise HTTPException(status_code=404, detail="Task not found")
 
     task = task_store[task_id]
-    return TaskStatus(**task)
+    return TaskStatus(**task.to_dict(legacy))
 
 
 @app.get("/tasks")
-async def list_tasks(status: Optional[str] = None, limit: int = 50, offset: int = 0):
+async def list_tasks(
+    status: Optional[str] = None, limit: int = 50, offset: int = 0, legacy: bool = False
+):
     """List all tasks with optional filtering"""
-    tasks = list(task_store.values())
-
-    # Filter by status if provided
+    # Filter by status if provided, then paginate without copying the whole store
+    start = max(offset, 0)
+    stop = start + max(limit, 0)
     if status:
-        tasks = [t for t in tasks if t["status"] == status]
-
-    # Apply pagination
-    total = len(tasks)
-    tasks = tasks[offset : offset + limit]
+        task_ids = task_index_by_status.get(status, {})
+        total = len(task_ids)
+        tasks = [task_store[task_id].to_dict(legacy) for task_id in islice(task_ids, start, stop)]
+    else:
+        total = len(task_store)
+        tasks = [task.to_dict(legacy) for task in islice(task_store.values(), start, stop)]
 
     return {"tasks": tasks, "total": total, "limit": limit, "offset": offset}
 
@@ -203,18 +287,28 @@ async def cancel_task(task_id: str):
         raise HTTPException(status_code=404, detail="Task not found")
 
     task = task_store[task_id]
-    if task["status"] == "completed":
+    if task.status == "completed":
         raise HTTPException(status_code=400, detail="Cannot cancel completed task")
 
     # Mark as cancelled
-    task["status"] = "cancelled"
-    task["completed_at"] = datetime.now()
-    task["error"] = "Task cancelled by user"
+    _set_task_status(task, "cancelled")
+    task.completed_at = datetime.now()
+    task.error = "Task cancelled by user"
 
     log.info(f"Task {task_id} cancelled")
     return {"message": "Task cancelled successfully"}
 
 
+def _fail_task(task: TaskRecord, error_msg: str) -> None:
+    """Mark a task failed, unless it was cancelled while it ran"""
+    if task.status == "cancelled":
+        return
+    _set_task_status(task, "failed")
+    task.completed_at = datetime.now()
+    task.error = error_msg
+    task.add_log("error", error_msg, task.completed_at)
+
+
 async def execute_task_background(
     task_id: str,
     task_description: str,
@@ -223,6 +317,7 @@ async def execute_task_background(
     enable_security: bool,
 ):
     """Execute task in background"""
+    task = task_store[task_id]
     try:
         log.info(f"Starting background execution for task {task_id}")
 
@@ -231,43 +326,30 @@ async def execute_task_background(
             task_description, max_iterations=max_iterations, use_real_browser=use_real_browser
         )
 
+        # A run cannot be interrupted, but one cancelled meanwhile keeps its cancelled status
+        if task.status == "cancelled":
+            log.info(f"Task {task_id} finished after it was cancelled, discarding its result")
+            return
+
         # Update task status
-        task_store[task_id]["status"] = "completed"
-        task_store[task_id]["completed_at"] = datetime.now()
-        task_store[task_id]["result"] = dict(result)
+        _set_task_status(task, "completed")
+        task.completed_at = datetime.now()
+        task.result = dict(result)
 
         # Add completion log
-        task_store[task_id]["logs"].append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "type": "success",
-                "message": "Task completed successfully",
-            }
-        )
+        task.add_log("success", "Task completed successfully", task.completed_at)
 
         log.info(f"Task {task_id} completed successfully")
 
     except BrowserFreakError as e:
         error_msg = f"BrowserFreak error: {str(e)}"
         log.error(f"Task {task_id} failed: {error_msg}")
-
-        task_store[task_id]["status"] = "failed"
-        task_store[task_id]["completed_at"] = datetime.now()
-        task_store[task_id]["error"] = error_msg
-        task_store[task_id]["logs"].append(
-            {"timestamp": datetime.now().isoformat(), "type": "error", "message": error_msg}
-        )
+        _fail_task(task, error_msg)
 
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
         log.error(f"Task {task_id} failed with unexpected error: {error_msg}", exc_info=True)
-
-        task_store[task_id]["status"] = "failed"
-        task_store[task_id]["completed_at"] = datetime.now()
-        task_store[task_id]["error"] = error_msg
-        task_store[task_id]["logs"].append(
-            {"timestamp": datetime.now().isoformat(), "type": "error", "message": error_msg}
-        )
+        _fail_task(task, error_msg)
 
 
 @app.exception_handler(BrowserFreakError)
@@ -293,12 +375,20 @@ async def general_exception_handler(request: Request, exc: Exception):
 async def startup_event():
     """Application startup tasks"""
     log.info("BrowserFreak API server starting up")
+    app.state.workers = [
+        asyncio.create_task(_worker(task_queue)) for _ in range(settings.agent.max_concurrent_tasks)
+    ]
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown tasks"""
     log.info("BrowserFreak API server shutting down")
+    workers = getattr(app.state, "workers", [])
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    await shutdown_browser_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+"""
+Skill cache for BrowserFreak - replays the tool calls that completed a task before
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from .config import settings
+from .logging_config import log
+
+# Tasks remembered per process before the oldest skill is dropped
+_MAX_SKILLS = 256
+
+
+def _task_key(task: str) -> str:
+    """Key a task by its text, ignoring case and whitespace differences"""
+    return hashlib.sha256(" ".join(task.lower().split()).encode()).hexdigest()
+
+
+class SkillCache:
+    """Remembers successful tool call sequences per task so repeats skip the decision engine"""
+
+    def __init__(self, max_skills: int = _MAX_SKILLS):
+        self._max_skills = max_skills
+        self._skills: Dict[str, List[Dict[str, Any]]] = {}
+
+    def lookup(self, task: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the tool calls that completed a task before
+
+        Args:
+            task: Task description
+
+        Returns:
+            List of {"name", "args"} tool calls, or None if the task has no skill
+        """
+        if not settings.agent.enable_skill_cache:
+            return None
+        return self._skills.get(_task_key(task))
+
+    def store(self, task: str, tool_calls: List[Dict[str, Any]]) -> None:
+        """
+        Remember the tool calls that completed a task
+
+        Args:
+            task: Task description
+            tool_calls: Tool calls in execution order, each with "name" and "args"
+        """
+        if not settings.agent.enable_skill_cache or not tool_calls:
+            return
+
+        key = _task_key(task)
+        self._skills.pop(key, None)
+        if len(self._skills) >= self._max_skills:
+            # Dicts keep insertion order, so the first key is the oldest skill
+            del self._skills[next(iter(self._skills))]
+        self._skills[key] = [{"name": call["name"], "args": call["args"]} for call in tool_calls]
+        log.debug(f"Stored skill with {len(tool_calls)} tool calls for task: {task[:100]}")
+
+    def forget(self, task: str) -> None:
+        """
+        Drop the skill for a task, e.g. after replaying it failed
+
+        Args:
+            task: Task description
+        """
+        if self._skills.pop(_task_key(task), None) is not None:
+            log.info(f"Dropped skill for task: {task[:100]}")
+
+
+# Global skill cache instance
+skill_cache = SkillCache()
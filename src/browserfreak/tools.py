@@ -2,9 +2,28 @@
 Browser automation tools for BrowserFreak
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from .browser_manager import (
+    BrowserSession,
     click_element,
     get_interactive_elements,
     navigate_to_url,
@@ -13,169 +32,288 @@ from .browser_manager import (
 )
 from .logging_config import log
 
-# Browser context type alias
-BrowserContext = Tuple[Any, Any, Optional[Any], Any]
+# Browser context type alias; wrappers take None instead of a context to run in mock mode
+BrowserContext = BrowserSession
 
+# Page state reported in mock mode and when the real page cannot be read
+MOCK_PAGE_HTML = "<html><body><button>Submit</button></body></html>"
 
-async def click_element_wrapper(context: Optional[BrowserContext], selector: str) -> bool:
-    """Click on an element matching the CSS selector"""
-    if not context:
-        log.debug(f"Mock clicking element: {selector}")
-        return True
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
 
-    try:
-        return await click_element(context, selector)
-    except Exception as e:
-        log.error(f"Failed to click element '{selector}': {e}")
-        return False
+# Marks a tool that handles mock mode itself
+_NO_MOCK = object()
 
 
-async def type_text_wrapper(context: Optional[BrowserContext], selector: str, text: str) -> bool:
-    """Type text into an element matching the CSS selector"""
-    if not context:
-        log.debug(f"Mock typing '{text[:50]}' into element: {selector}")
-        return True
+# Set inside a tool group, where a tool that raises fails its siblings instead of
+# quietly returning its default; a falsy result alone is not a failure there
+_raise_tool_failures: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "_raise_tool_failures", default=False
+)
 
-    try:
-        return await type_text(context, selector, text)
-    except Exception as e:
-        log.error(f"Failed to type text into element '{selector}': {e}")
-        return False
 
+def _safe_tool(default: Any, mock: Any = _NO_MOCK) -> Callable[[F], F]:
+    """
+    Make a tool log failures and return a default instead of raising
 
+    Inside a tool group the failure is raised as _ToolFailed instead, so the calls
+    running alongside it are cancelled.
+
+    Args:
+        default: Value returned when the wrapped coroutine raises
+        mock: Value returned without calling the coroutine when the context is None;
+            left unset, the coroutine handles mock mode itself
+    """
+
+    def decorator(tool: F) -> F:
+        has_mock = mock is not _NO_MOCK
+
+        @functools.wraps(tool)
+        async def wrapper(context: Optional[BrowserContext], *args: Any, **kwargs: Any) -> Any:
+            if has_mock and context is None:
+                log.debug("Mock {}: {} {}", tool.__name__, args, kwargs)
+                return mock
+            try:
+                return await tool(context, *args, **kwargs)
+            except Exception as e:
+                log.error(f"{tool.__name__} failed: {e}")
+                if _raise_tool_failures.get():
+                    raise _ToolFailed(tool.__name__) from e
+                return default
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+# Browser actions exposed as tools directly; in mock mode they report success
+click_element_wrapper = _safe_tool(default=False, mock=True)(click_element)
+type_text_wrapper = _safe_tool(default=False, mock=True)(type_text)
+scroll_page_wrapper = _safe_tool(default=False, mock=True)(scroll_page)
+
+
+@_safe_tool(default=MOCK_PAGE_HTML, mock=MOCK_PAGE_HTML)
 async def get_page_state_wrapper(context: Optional[BrowserContext]) -> str:
     """Get the current page state and DOM representation"""
-    if not context:
-        return "<html><body><button>Submit</button></body></html>"
+    # The decorator answers mock mode, so a context is always given here
+    result = await get_interactive_elements(cast(BrowserContext, context))
+    return cast(str, result.get("cleaned_html", MOCK_PAGE_HTML))
 
-    try:
-        result = await get_interactive_elements(context)
-        return result.get("cleaned_html", "<html><body><button>Submit</button></body></html>")
-    except Exception as e:
-        log.error(f"Failed to get page state: {e}")
-        return "<html><body><button>Submit</button></body></html>"
-
-
-async def scroll_page_wrapper(
-    context: Optional[BrowserContext],
-    direction: str = "down",
-    amount: int = 500,
-    element_selector: Optional[str] = None,
-    smooth: bool = False,
-) -> bool:
-    """Scroll the page or a specific element in the specified direction"""
-    if not context:
-        log.debug(f"Mock scrolling {direction} by {amount} pixels")
-        return True
 
-    try:
-        return await scroll_page(context, direction, amount, element_selector, smooth)
-    except Exception as e:
-        log.error(f"Failed to scroll {direction}: {e}")
-        return False
+@_safe_tool(default=None)
+async def _page_html(context: BrowserContext) -> Optional[str]:
+    """Get the cleaned HTML of the current page, or None if the page could not be read"""
+    result = await get_interactive_elements(context)
+    return cast(str, result.get("cleaned_html", ""))
+
 
+@functools.lru_cache(maxsize=256)
+def _resolve_website_url(website_name: str) -> str:
+    """Guess a website's URL from its name; agents tend to revisit the same few sites"""
+    # Basic URL resolution - could be enhanced with AI
+    return f"https://www.{website_name.lower().replace(' ', '')}.com"
 
-async def navigate_to_website_wrapper(context: Optional[BrowserContext], website_name: str) -> bool:
-    """Navigate to a website using its name"""
-    if not context:
-        log.debug(f"Mock navigating to website: {website_name}")
+
+@_safe_tool(default=False)
+async def navigate_to_website_wrapper(
+    context: Optional[BrowserContext], website_name: str, return_state: bool = False
+) -> Union[bool, Dict[str, Any]]:
+    """
+    Navigate to a website using its name
+
+    Args:
+        context: Browser context (optional for mock mode)
+        website_name: Name of the website to navigate to
+        return_state: Also snapshot the loaded page, saving a separate get_page_state call
+
+    Returns:
+        False if navigation failed; otherwise True, or {"ok": True, "html": ...} when
+        return_state is set, with html None if only the snapshot failed
+    """
+    if context is None:
+        log.debug("Mock navigating to website: {}", website_name)
+        if return_state:
+            return {"ok": True, "html": await get_page_state_wrapper(context)}
         return True
 
-    try:
-        # Basic URL resolution - could be enhanced with AI
-        base_url = f"https://www.{website_name.lower().replace(' ', '')}.com"
-        await navigate_to_url(context, base_url)
+    await navigate_to_url(context, _resolve_website_url(website_name))
+    if not return_state:
         return True
-    except Exception as e:
-        log.error(f"Failed to navigate to website '{website_name}': {e}")
-        return False
 
+    # The navigation itself worked, so a failed snapshot is left to a later get_page_state
+    return {"ok": True, "html": await _page_html(context)}
 
-def get_browser_tools() -> List[Dict[str, Any]]:
-    """Get the list of available browser automation tools"""
-    return [
-        {
-            "name": "click_element",
-            "description": "Click on an element using CSS selector. Use this when you need to interact with buttons, links, or other clickable elements on a webpage.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "CSS selector for the element to click",
-                    }
-                },
-                "required": ["selector"],
+
+# Tool schemas passed to the decision engine, built once at import and shared by every
+# caller, so they are kept in a tuple; the schema dicts stay plain dicts because LangChain
+# and the Anthropic SDK only accept dicts
+_BROWSER_TOOLS: Tuple[Dict[str, Any], ...] = (
+    {
+        "name": "click_element",
+        "description": "Click on an element using CSS selector. Use this when you need to interact with buttons, links, or other clickable elements on a webpage.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "CSS selector for the element to click",
+                }
             },
+            "required": ["selector"],
         },
-        {
-            "name": "type_text",
-            "description": "Type text into an input field using CSS selector. Use this when you need to fill out forms or input text into text fields.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "selector": {
-                        "type": "string",
-                        "description": "CSS selector for the input element",
-                    },
-                    "text": {"type": "string", "description": "Text to type into the element"},
+    },
+    {
+        "name": "type_text",
+        "description": "Type text into an input field using CSS selector. Use this when you need to fill out forms or input text into text fields.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "selector": {
+                    "type": "string",
+                    "description": "CSS selector for the input element",
                 },
-                "required": ["selector", "text"],
+                "text": {"type": "string", "description": "Text to type into the element"},
             },
+            "required": ["selector", "text"],
         },
-        {
-            "name": "get_page_state",
-            "description": "Get current page state and DOM representation. Use this to analyze the current webpage structure and content before deciding on actions.",
-            "parameters": {"type": "object", "properties": {}},
-        },
-        {
-            "name": "scroll_page",
-            "description": "Scroll the page or a specific element in the specified direction. Use this when you need to access content that's not currently visible on the page.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "direction": {
-                        "type": "string",
-                        "description": "Direction to scroll: 'up', 'down', 'left', or 'right'",
-                        "enum": ["up", "down", "left", "right"],
-                    },
-                    "amount": {
-                        "type": "number",
-                        "description": "Number of pixels to scroll (positive number)",
-                        "default": 500,
-                    },
-                    "element_selector": {
-                        "type": "string",
-                        "description": "Optional CSS selector for a specific element to scroll. If not provided, scrolls the main page.",
-                    },
-                    "smooth": {
-                        "type": "boolean",
-                        "description": "Whether to use smooth scrolling animation",
-                        "default": False,
-                    },
+    },
+    {
+        "name": "get_page_state",
+        "description": "Get current page state and DOM representation. Use this to analyze the current webpage structure and content before deciding on actions.",
+        "parameters": {"type": "object", "properties": {}},
+    },
+    {
+        "name": "scroll_page",
+        "description": "Scroll the page or a specific element in the specified direction. Use this when you need to access content that's not currently visible on the page.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "direction": {
+                    "type": "string",
+                    "description": "Direction to scroll: 'up', 'down', 'left', or 'right'",
+                    "enum": ["up", "down", "left", "right"],
+                },
+                "amount": {
+                    "type": "number",
+                    "description": "Number of pixels to scroll (positive number)",
+                    "default": 500,
+                },
+                "element_selector": {
+                    "type": "string",
+                    "description": "Optional CSS selector for a specific element to scroll. If not provided, scrolls the main page.",
+                },
+                "smooth": {
+                    "type": "boolean",
+                    "description": "Whether to use smooth scrolling animation",
+                    "default": False,
                 },
-                "required": ["direction"],
             },
+            "required": ["direction"],
         },
-        {
-            "name": "navigate_to_website",
-            "description": "Navigate to a website using its name. The AI will use its knowledge to determine the correct URL. Use this when the user mentions a website by name like 'amazon', 'google', etc.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "website_name": {
-                        "type": "string",
-                        "description": "Name of the website to navigate to (e.g., 'amazon', 'google', 'youtube')",
-                    }
-                },
-                "required": ["website_name"],
+    },
+    {
+        "name": "navigate_to_website",
+        "description": "Navigate to a website using its name. The AI will use its knowledge to determine the correct URL. Use this when the user mentions a website by name like 'amazon', 'google', etc.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "website_name": {
+                    "type": "string",
+                    "description": "Name of the website to navigate to (e.g., 'amazon', 'google', 'youtube')",
+                }
+            },
+            "required": ["website_name"],
+        },
+    },
+    {
+        "name": "navigate_and_snapshot",
+        "description": "Navigate to a website using its name and return the loaded page state in the same step. Use this instead of navigate_to_website when you will analyze the page right after navigating.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "website_name": {
+                    "type": "string",
+                    "description": "Name of the website to navigate to (e.g., 'amazon', 'google', 'youtube')",
+                }
             },
+            "required": ["website_name"],
         },
-    ]
+    },
+)
+
+
+# The schemas serialized once, with sorted keys so the string is stable
+_BROWSER_TOOLS_JSON = json.dumps(_BROWSER_TOOLS, sort_keys=True)
+
+
+def get_browser_tools() -> Sequence[Dict[str, Any]]:
+    """Get the list of available browser automation tools"""
+    return _BROWSER_TOOLS
+
+
+def get_browser_tools_json() -> str:
+    """Get the browser tool schemas as JSON, serialized once at import"""
+    return _BROWSER_TOOLS_JSON
+
+
+async def _get_page_state(context: Optional[BrowserContext], **_: Any) -> str:
+    """Get the page state, ignoring any arguments the caller passed"""
+    return await get_page_state_wrapper(context)
+
+
+async def _navigate_and_snapshot(context: Optional[BrowserContext], website_name: str) -> Any:
+    """Navigate to a website and return the loaded page state"""
+    return await navigate_to_website_wrapper(context, website_name, return_state=True)
+
+
+# Tool wrappers by tool name
+_DISPATCH: Dict[str, Callable[..., Awaitable[Any]]] = {
+    "click_element": click_element_wrapper,
+    "type_text": type_text_wrapper,
+    "get_page_state": _get_page_state,
+    "scroll_page": scroll_page_wrapper,
+    "navigate_to_website": navigate_to_website_wrapper,
+    "navigate_and_snapshot": _navigate_and_snapshot,
+}
+
+
+def _arg_names(tool: Dict[str, Any]) -> Tuple[FrozenSet[str], Optional[FrozenSet[str]]]:
+    """Get a tool's required and accepted argument names, None accepting any names"""
+    parameters = tool["parameters"]
+    required = frozenset(parameters.get("required", ()))
+    signature = inspect.signature(_DISPATCH[tool["name"]])
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in signature.parameters.values()):
+        return required, None
+    return required, frozenset(parameters["properties"])
+
+
+# Argument names per tool from its schema, so malformed calls are rejected before dispatch
+_TOOL_ARGS = {tool["name"]: _arg_names(tool) for tool in _BROWSER_TOOLS}
+
+
+# Browser contexts of running tasks by task id, for callers that only know the task
+_context_cache: Dict[str, BrowserContext] = {}
+
+
+def cache_task_context(task_id: str, context: BrowserContext) -> None:
+    """Remember a task's browser context until evict_task_context is called"""
+    _context_cache[task_id] = context
+
+
+def evict_task_context(task_id: str) -> None:
+    """Forget a task's browser context, e.g. before the context is closed"""
+    _context_cache.pop(task_id, None)
+
+
+def get_task_context(task_id: Optional[str]) -> Optional[BrowserContext]:
+    """Get the browser context cached for a task, or None to run in mock mode"""
+    return _context_cache.get(task_id) if task_id is not None else None
 
 
 async def execute_tool(
-    tool_name: str, tool_args: Dict[str, Any], context: Optional[BrowserContext] = None
+    tool_name: str,
+    tool_args: Dict[str, Any],
+    context: Optional[BrowserContext] = None,
+    task_id: Optional[str] = None,
 ) -> Any:
     """
     Execute a tool with the given arguments
@@ -184,26 +322,119 @@ async def execute_tool(
         tool_name: Name of the tool to execute
         tool_args: Arguments for the tool
         context: Browser context (optional for mock mode)
+        task_id: Task whose cached browser context is used when no context is given
 
     Returns:
         Tool execution result
     """
-    log.debug(f"Executing tool: {tool_name} with args: {tool_args}")
+    # Pass values as arguments so the args dict is only formatted when DEBUG is enabled
+    log.debug("Executing tool: {} with args: {}", tool_name, tool_args)
+
+    if context is None:
+        context = get_task_context(task_id)
+
+    tool = _DISPATCH.get(tool_name)
+    if tool is None:
+        log.warning(f"Unknown tool: {tool_name}")
+        return False
+
+    required, accepted = _TOOL_ARGS[tool_name]
+    missing = required - tool_args.keys()
+    unexpected = tool_args.keys() - accepted if accepted is not None else set()
+    if missing or unexpected:
+        log.warning(
+            f"Rejected {tool_name} call: missing args {sorted(missing)}, "
+            f"unexpected args {sorted(unexpected)}"
+        )
+        return False
 
     try:
-        if tool_name == "click_element":
-            return await click_element_wrapper(context, **tool_args)
-        elif tool_name == "type_text":
-            return await type_text_wrapper(context, **tool_args)
-        elif tool_name == "get_page_state":
-            return await get_page_state_wrapper(context)
-        elif tool_name == "scroll_page":
-            return await scroll_page_wrapper(context, **tool_args)
-        elif tool_name == "navigate_to_website":
-            return await navigate_to_website_wrapper(context, **tool_args)
-        else:
-            log.warning(f"Unknown tool: {tool_name}")
-            return False
+        return await tool(context, **tool_args)
+    except _ToolFailed:
+        raise
     except Exception as e:
         log.error(f"Tool execution failed for {tool_name}: {e}")
         return False
+
+
+# Tools that never run alongside other calls: clicks and navigations may change what the
+# page shows, and typing moves the page's focus, which is shared by every field, so two
+# concurrent fills could write into the wrong one
+_BARRIER_TOOLS = frozenset(
+    {"click_element", "type_text", "navigate_to_website", "navigate_and_snapshot"}
+)
+
+
+class _ToolFailed(Exception):
+    """Raised inside a tool group to cancel the calls still running"""
+
+
+async def _execute_group(
+    group: List[Tuple[str, Dict[str, Any]]], context: Optional[BrowserContext]
+) -> List[Any]:
+    """Run independent tool calls together, cancelling the rest once one raises"""
+    if len(group) == 1:
+        return [await execute_tool(*group[0], context)]
+
+    # Calls that raised or were cancelled keep the failure result
+    results: List[Any] = [False] * len(group)
+
+    async def run(index: int, tool_name: str, tool_args: Dict[str, Any]) -> None:
+        # Each task runs in a copy of the context, so the flag stays within the group
+        _raise_tool_failures.set(True)
+        results[index] = await execute_tool(tool_name, tool_args, context)
+
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            for index, (tool_name, tool_args) in enumerate(group):
+                task_group.create_task(run(index, tool_name, tool_args))
+    except* _ToolFailed as failures:
+        failed = ", ".join(str(e) for e in failures.exceptions)
+        log.warning(f"Cancelled the tool calls running alongside failed {failed}")
+    return results
+
+
+async def execute_tools(
+    calls: Sequence[Tuple[str, Dict[str, Any]]],
+    context: Optional[BrowserContext] = None,
+    task_id: Optional[str] = None,
+) -> List[Any]:
+    """
+    Execute several tool calls, running independent ones concurrently
+
+    Only consecutive scrolls of different elements run together. A scroll of an element
+    already used in the current group, any call that acts on the whole page, and every
+    click, fill or navigation waits for the calls before it and runs before the calls
+    after it, so fields are filled one at a time and a submit click follows them.
+
+    Args:
+        calls: (tool_name, tool_args) pairs in the order they were requested
+        context: Browser context (optional for mock mode)
+        task_id: Task whose cached browser context is used when no context is given
+
+    Returns:
+        Tool execution results in the same order as calls
+    """
+    if context is None:
+        context = get_task_context(task_id)
+
+    results: List[Any] = []
+    group: List[Tuple[str, Dict[str, Any]]] = []
+    targets: set = set()
+
+    for tool_name, tool_args in calls:
+        # None marks a call that may touch anything on the page
+        target = (
+            None
+            if tool_name in _BARRIER_TOOLS
+            else tool_args.get("selector") or tool_args.get("element_selector")
+        )
+        if group and (target is None or target in targets or None in targets):
+            results.extend(await _execute_group(group, context))
+            group, targets = [], set()
+        group.append((tool_name, tool_args))
+        targets.add(target)
+
+    if group:
+        results.extend(await _execute_group(group, context))
+    return results
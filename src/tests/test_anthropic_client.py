@@ -0,0 +1,144 @@
+"""
+Tests for the streaming and batch decision paths of the Anthropic client
+"""
+
+import asyncio
+import dataclasses
+from types import SimpleNamespace
+from typing import Any, List, cast
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from browserfreak.anthropic_client import AnthropicClient, anthropic_client
+from browserfreak.config import get_settings
+from browserfreak.decision_engine import decision_engine
+
+
+class _FakeChain:
+    """Chain stand-in that streams a fixed list of chunks"""
+
+    def __init__(self, chunks: List[AIMessageChunk]):
+        self.chunks = chunks
+        self.streamed = 0
+
+    async def astream(self, _input: Any):
+        for chunk in self.chunks:
+            self.streamed += 1
+            yield chunk
+
+
+def _client(chain: _FakeChain) -> AnthropicClient:
+    client = AnthropicClient()
+    client._client = object()  # type: ignore[assignment]
+    client._get_chain = lambda tools: cast(Any, chain)  # type: ignore[method-assign]
+    return client
+
+
+def _tool_chunk() -> AIMessageChunk:
+    return AIMessageChunk(
+        content="",
+        tool_call_chunks=[
+            {"name": "click_element", "args": '{"selector": "#submit"}', "id": "1", "index": 1}
+        ],
+    )
+
+
+async def test_prose_mentioning_finish_before_tool_call_keeps_tool_call():
+    chain = _FakeChain(
+        [
+            AIMessageChunk(content="I'll click submit to "),
+            AIMessageChunk(content="finish the signup."),
+            _tool_chunk(),
+        ]
+    )
+    decision = await _client(chain).make_decision([{"role": "user", "content": "x"}], "", [])
+
+    assert decision == {"tool_calls": [{"name": "click_element", "args": {"selector": "#submit"}}]}
+    assert chain.streamed == 3
+
+
+async def test_bare_finish_reply_closes_stream_early():
+    chain = _FakeChain(
+        [
+            AIMessageChunk(content="FIN"),
+            AIMessageChunk(content="ISH"),
+            AIMessageChunk(content=""),
+            AIMessageChunk(content=""),
+        ]
+    )
+    decision = await _client(chain).make_decision([{"role": "user", "content": "x"}], "", [])
+
+    assert decision == {"content": "FINISH"}
+    assert chain.streamed == 2
+
+
+async def test_finish_inside_prose_is_still_reported_at_end_of_stream():
+    chain = _FakeChain([AIMessageChunk(content="All done. "), AIMessageChunk(content="FINISH")])
+    decision = await _client(chain).make_decision([{"role": "user", "content": "x"}], "", [])
+
+    assert decision == {"content": "FINISH"}
+    assert chain.streamed == 2
+
+
+class _FakeBatches:
+    """Message Batches stand-in whose batch never ends"""
+
+    def __init__(self) -> None:
+        self.cancelled: List[str] = []
+
+    async def create(self, requests: Any) -> Any:
+        return SimpleNamespace(id="batch_1", processing_status="in_progress")
+
+    async def retrieve(self, batch_id: str) -> Any:
+        return SimpleNamespace(id=batch_id, processing_status="in_progress")
+
+    async def cancel(self, batch_id: str) -> None:
+        self.cancelled.append(batch_id)
+
+
+@pytest.fixture
+def batches(monkeypatch) -> _FakeBatches:
+    """Route the shared client's batch calls to a fake and shorten the batch timeout"""
+    fake = _FakeBatches()
+    settings = get_settings()
+    monkeypatch.setattr(
+        settings,
+        "anthropic",
+        dataclasses.replace(settings.anthropic, batch_timeout=0.05, batch_poll_interval=0.01),
+    )
+    monkeypatch.setattr(anthropic_client, "_client", object())
+    monkeypatch.setattr(
+        anthropic_client,
+        "_get_batch_client",
+        lambda: SimpleNamespace(messages=SimpleNamespace(batches=fake)),
+    )
+    return fake
+
+
+async def test_batch_past_its_timeout_is_cancelled_and_decided_concurrently(batches, monkeypatch):
+    async def make_decisions(prompts: Any, tools: Any, max_concurrency: int = 10) -> Any:
+        return [{"content": "FINISH"} for _ in prompts]
+
+    monkeypatch.setattr(anthropic_client, "make_decisions", make_decisions)
+
+    decisions = await decision_engine.batch_decide([([{"role": "user", "content": "x"}], "")])
+
+    assert decisions == [{"content": "FINISH"}]
+    assert batches.cancelled == ["batch_1"]
+
+
+async def test_cancelled_batch_wait_cancels_the_remote_batch(batches, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(
+        settings, "anthropic", dataclasses.replace(settings.anthropic, batch_timeout=60)
+    )
+    waiting = asyncio.create_task(
+        anthropic_client.make_batch_decisions([([{"role": "user", "content": "x"}], "")], [])
+    )
+    await asyncio.sleep(0.02)
+    waiting.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert batches.cancelled == ["batch_1"]
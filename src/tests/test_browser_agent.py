@@ -0,0 +1,122 @@
+"""
+Tests for recording and replaying skills in the agent workflow
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from browserfreak import browser_agent
+from browserfreak.skill_cache import SkillCache
+
+TASK = "Search for shoes"
+
+SEARCH_CALLS = [
+    {"name": "type_text", "args": {"selector": "#q", "text": "shoes"}},
+    {"name": "click_element", "args": {"selector": "#go"}},
+]
+
+
+class _FakeRun:
+    """Stands in for the browser and the decision engine around the agent graph"""
+
+    def __init__(self, monkeypatch):
+        self.decisions: List[Dict[str, Any]] = []
+        self.executed: List[List[Tuple[str, Dict[str, Any]]]] = []
+        self.failing: set = set()
+        self.skills = SkillCache()
+
+        async def make_decision(messages, page_context, history_summary=None):
+            return self.decisions.pop(0)
+
+        async def execute_tools(calls, context=None, task_id=None):
+            self.executed.append(list(calls))
+            return [name not in self.failing for name, _ in calls]
+
+        async def noop(*args: Any, **kwargs: Any) -> None:
+            return None
+
+        async def create_browser_context() -> object:
+            return object()
+
+        async def page_state(context: Any) -> str:
+            return "<html></html>"
+
+        monkeypatch.setattr(browser_agent.decision_engine, "make_decision", make_decision)
+        monkeypatch.setattr(browser_agent, "execute_tools", execute_tools)
+        monkeypatch.setattr(browser_agent, "create_browser_context", create_browser_context)
+        monkeypatch.setattr(browser_agent, "navigate_to_url", noop)
+        monkeypatch.setattr(browser_agent, "close_browser_context", noop)
+        monkeypatch.setattr(browser_agent, "get_page_state_wrapper", page_state)
+        monkeypatch.setattr(browser_agent, "skill_cache", self.skills)
+
+    async def run(self) -> Dict[str, Any]:
+        return await browser_agent.run_agent_workflow(TASK, use_real_browser=True)
+
+
+@pytest.fixture
+def fake_run(monkeypatch) -> _FakeRun:
+    return _FakeRun(monkeypatch)
+
+
+async def test_skill_round_trip_replays_every_call_in_one_turn(fake_run):
+    fake_run.decisions.append({"tool_calls": SEARCH_CALLS})
+    await fake_run.run()
+    assert fake_run.skills.lookup(TASK) == SEARCH_CALLS
+
+    # The repeat needs no decision and runs the whole skill as one batch
+    final_state = await fake_run.run()
+
+    assert final_state["task_complete"] and final_state["skill_replay"]
+    assert fake_run.executed[1] == [(call["name"], call["args"]) for call in SEARCH_CALLS]
+    assert fake_run.skills.lookup(TASK) == SEARCH_CALLS
+
+
+async def test_run_with_a_failed_call_is_not_stored(fake_run):
+    fake_run.failing.add("click_element")
+    fake_run.decisions.append({"tool_calls": SEARCH_CALLS})
+
+    final_state = await fake_run.run()
+
+    assert final_state["tools_failed"]
+    assert fake_run.skills.lookup(TASK) is None
+
+
+async def test_failed_replay_forgets_skill_and_asks_for_a_decision(fake_run):
+    fake_run.skills.store(TASK, SEARCH_CALLS)
+    fake_run.failing.add("click_element")
+    fake_run.decisions.append({"content": "FINISH"})
+
+    final_state = await fake_run.run()
+
+    assert final_state["task_complete"]
+    assert fake_run.decisions == []
+    assert fake_run.skills.lookup(TASK) is None
+
+
+async def test_page_state_call_result_becomes_page_map(monkeypatch):
+    async def execute_tools(calls, context=None, task_id=None):
+        return ["<html>fresh</html>"]
+
+    async def refetch(context: Any) -> str:
+        raise AssertionError("page state was captured twice")
+
+    monkeypatch.setattr(browser_agent, "execute_tools", execute_tools)
+    monkeypatch.setattr(browser_agent, "get_page_state_wrapper", refetch)
+    state: Any = {
+        "messages": [
+            {"role": "user", "content": TASK},
+            {
+                "role": "assistant",
+                "tool_calls": [{"id": "1", "name": "get_page_state", "args": {}}],
+            },
+        ],
+        "page_map": "<html>stale</html>",
+        "page_map_dirty": True,
+        "skill_steps": [],
+    }
+
+    state = await browser_agent.tool_node(state, context=object())  # type: ignore[arg-type]
+
+    assert state["page_map"] == "<html>fresh</html>"
+    assert not state["page_map_dirty"]
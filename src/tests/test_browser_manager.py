@@ -0,0 +1,203 @@
+"""
+Tests for the browser context pool and deferred page loads
+"""
+
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from browserfreak import browser_manager
+from browserfreak.browser_manager import BrowserContextPool, BrowserSession
+
+
+class _FakeContextPage:
+    def __init__(self, context: "_FakeContext"):
+        self.context = context
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+
+class _FakeContext:
+    def __init__(self, fail_new_page: bool = False):
+        self.pages: List[Any] = []
+        self.closed = False
+        self.fail_new_page = fail_new_page
+
+    def set_default_timeout(self, timeout: float) -> None:
+        pass
+
+    def set_default_navigation_timeout(self, timeout: float) -> None:
+        pass
+
+    async def new_page(self) -> _FakeContextPage:
+        await asyncio.sleep(0)
+        if self.fail_new_page:
+            raise RuntimeError("page crashed")
+        page = _FakeContextPage(self)
+        self.pages.append(page)
+        return page
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.contexts: List[_FakeContext] = []
+        self.fail_new_page = False
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def new_context(self) -> _FakeContext:
+        context = _FakeContext(self.fail_new_page)
+        self.contexts.append(context)
+        return context
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch) -> BrowserContextPool:
+    """A two-slot pool whose browser is a fake, so no Chromium is launched"""
+    browser = _FakeBrowser()
+    pool = BrowserContextPool(max_contexts=2)
+    pool._browser = browser  # type: ignore[assignment]
+
+    async def ensure_browser() -> _FakeBrowser:
+        return browser
+
+    monkeypatch.setattr(pool, "_ensure_browser", ensure_browser)
+    return pool
+
+
+async def test_acquire_waits_for_a_free_slot(pool):
+    first = await pool.acquire()
+    await pool.acquire()
+
+    third = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.01)
+    assert not third.done()
+
+    await pool.release(first)
+    session = await asyncio.wait_for(third, timeout=1)
+    assert pool.owns(session.context)
+
+
+async def test_released_context_is_closed_and_replaced(pool):
+    first = await pool.acquire()
+    await pool.release(first)
+
+    assert first.context.closed
+    assert not pool.owns(first.context)
+
+    # The replacement prepared on release is handed out next, not the closed context
+    second = await pool.acquire()
+    assert second.context is pool._browser.contexts[1]
+    assert not second.context.closed
+
+
+async def test_releasing_a_foreign_session_frees_no_slot(pool):
+    await pool.acquire()
+    await pool.acquire()
+
+    stranger = BrowserSession(None, pool._browser, _FakeContext(), object())
+    await pool.release(stranger)
+
+    third = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.01)
+    assert not third.done()
+    third.cancel()
+
+
+async def test_failed_acquire_returns_its_slot_and_closes_its_context(pool):
+    pool._browser.fail_new_page = True
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            await pool.acquire()
+
+    assert all(context.closed for context in pool._browser.contexts)
+
+    pool._browser.fail_new_page = False
+    await asyncio.wait_for(pool.acquire(), timeout=1)
+    await asyncio.wait_for(pool.acquire(), timeout=1)
+
+
+async def test_health_page_is_shared_and_its_stale_context_closed(pool):
+    pages = await asyncio.gather(*(pool.health_page() for _ in range(5)))
+    assert len({id(page) for page in pages}) == 1
+    assert len(pool._browser.contexts) == 1
+
+    pages[0].closed = True
+    replacement = await pool.health_page()
+    assert replacement is not pages[0]
+    assert pool._browser.contexts[0].closed
+
+    await pool.close()
+    assert replacement.context.closed
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.gotos: List[str] = []
+        self.loaded = False
+
+    async def goto(self, url: str) -> None:
+        self.gotos.append(url)
+        await asyncio.sleep(0.02)
+
+    async def wait_for_load_state(self, state: str) -> None:
+        self.loaded = True
+
+
+async def test_concurrent_interactions_wait_for_one_deferred_load():
+    page = _FakePage()
+    browser_manager._deferred_pages[page] = ("https://example.com", "<html></html>")
+
+    async def interact() -> bool:
+        await browser_manager._load_deferred_page(page)  # type: ignore[arg-type]
+        return page.loaded
+
+    assert await asyncio.gather(interact(), interact()) == [True, True]
+    assert page.gotos == ["https://example.com"]
+
+
+class _MutablePage:
+    """Page stand-in whose fingerprint counts DOM changes like the injected observer"""
+
+    def __init__(self) -> None:
+        self.html = '<html><body><button id="a">A</button></body></html>'
+        self.mutations = 0
+        self.reads = 0
+
+    async def evaluate(self, script: str) -> List[Any]:
+        assert script == browser_manager._FINGERPRINT_JS
+        return ["token", self.mutations, "https://example.com"]
+
+    async def content(self) -> str:
+        self.reads += 1
+        return self.html
+
+    def mutate(self, html: str) -> None:
+        self.html = html
+        self.mutations += 1
+
+
+async def test_analysis_is_reused_until_the_dom_changes():
+    page = _MutablePage()
+    session = BrowserSession(None, None, None, page)  # type: ignore[arg-type]
+
+    first = await browser_manager.get_interactive_elements(session)
+    assert await browser_manager.get_interactive_elements(session) == first
+    assert page.reads == 1
+
+    # Same length as before, so only the mutation count tells the pages apart
+    page.mutate('<html><body><button id="b">B</button></body></html>')
+    changed = await browser_manager.get_interactive_elements(session)
+
+    assert page.reads == 2
+    assert changed != first
@@ -0,0 +1,36 @@
+"""
+Tests for lazy settings and submodule loading
+"""
+
+import os
+import subprocess
+import sys
+
+
+def test_importing_the_package_and_cli_loads_no_settings():
+    # A fresh interpreter, since this test process has loaded the settings already
+    code = (
+        "import browserfreak, browserfreak.cli, browserfreak.config as config\n"
+        "assert config.get_settings.cache_info().misses == 0\n"
+        "browserfreak.settings\n"
+        "assert config.get_settings.cache_info().misses == 1\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_concurrent_lazy_lookups_load_a_submodule_once():
+    code = (
+        "import threading, browserfreak\n"
+        "barrier = threading.Barrier(8)\n"
+        "clients = []\n"
+        "def lookup():\n"
+        "    barrier.wait()\n"
+        "    clients.append(browserfreak.anthropic_client)\n"
+        "threads = [threading.Thread(target=lookup) for _ in range(8)]\n"
+        "for thread in threads: thread.start()\n"
+        "for thread in threads: thread.join()\n"
+        "assert len(clients) == 8 and len({id(client) for client in clients}) == 1\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
@@ -4,50 +4,66 @@ Test script to verify the browser agent, browser manager, and FastAPI server int
 """
 
 import asyncio
+import sys
+from typing import List, Tuple
 
 import httpx
 
 from browserfreak.browser_agent import run_agent_workflow
 from browserfreak.browser_manager import health_check
 
+# Progress messages by stage, written out in one block once every stage has finished so
+# concurrently running stages do not interleave their output
+_notes: List[Tuple[str, str]] = []
+
+
+def _note(stage: str, message: str) -> None:
+    """Record a progress message for a test stage"""
+    _notes.append((stage, message))
+
 
 async def test_mock_mode():
     """Test the agent in mock mode (default behavior)"""
-    print("Testing mock mode...")
+    _note("mock_mode", "Testing mock mode...")
     task = "Click the submit button on the page"
     result = await run_agent_workflow(task, max_iterations=2)
-    print(f"Mock mode test completed. Task complete: {result['task_complete']}")
+    _note("mock_mode", f"Mock mode test completed. Task complete: {result['task_complete']}")
     return result
 
 
 async def test_real_browser_mode():
     """Test the agent with real browser integration"""
-    print("\nTesting real browser mode...")
+    _note("real_browser", "Testing real browser mode...")
     try:
         task = "Click the submit button on the page"
         result = await run_agent_workflow(task, max_iterations=2, use_real_browser=True)
-        print(f"Real browser mode test completed. Task complete: {result['task_complete']}")
+        _note(
+            "real_browser",
+            f"Real browser mode test completed. Task complete: {result['task_complete']}",
+        )
         return result
     except Exception as e:
-        print(f"Real browser test failed (expected if Playwright not installed): {e}")
+        _note(
+            "real_browser", f"Real browser test failed (expected if Playwright not installed): {e}"
+        )
         return None
 
 
 async def test_health_check():
     """Test the health check functionality"""
-    print("\nTesting health check...")
+    _note("health_check", "Testing health check...")
     try:
         health_status = await health_check()
-        print(f"Health check status: {health_status['status']}")
+        _note("health_check", f"Health check status: {health_status['status']}")
         return health_status
     except Exception as e:
-        print(f"Health check failed: {e}")
+        _note("health_check", f"Health check failed: {e}")
         return None
 
 
 async def test_fastapi_server():
     """Test FastAPI server endpoints"""
-    print("\nTesting FastAPI server endpoints...")
+    _note("fastapi_server", "Testing FastAPI server endpoints...")
 
     # Test data
     test_task = {
@@ -57,113 +73,127 @@ async def test_fastapi_server():
     }
 
     try:
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            # Test health endpoint
-            health_response = await client.get("/health")
-            print(f"Health endpoint status: {health_response.status_code}")
+        # One pooled client serves every request, so concurrent requests reuse connections
+        async with httpx.AsyncClient(
+            base_url="http://localhost:8000",
+            limits=httpx.Limits(max_keepalive_connections=10),
+        ) as client:
+            # Test health endpoint and task creation, which do not depend on each other
+            health_response, task_response = await asyncio.gather(
+                client.get("/health"), client.post("/tasks", json=test_task)
+            )
+            _note("fastapi_server", f"Health endpoint status: {health_response.status_code}")
 
             if health_response.status_code == 200:
                 health_data = health_response.json()
-                print(f"Health status: {health_data.get('status')}")
+                _note("fastapi_server", f"Health status: {health_data.get('status')}")
 
-            # Test task creation
-            task_response = await client.post("/tasks", json=test_task)
-            print(f"Task creation status: {task_response.status_code}")
+            _note("fastapi_server", f"Task creation status: {task_response.status_code}")
 
             if task_response.status_code == 200:
                 task_data = task_response.json()
                 task_id = task_data.get("task_id")
-                print(f"Created task with ID: {task_id}")
-
-                # Wait a moment for task to complete
-                await asyncio.sleep(2)
-
-                # Test task status retrieval
-                status_response = await client.get(f"/tasks/{task_id}")
-                print(f"Task status retrieval: {status_response.status_code}")
+                _note("fastapi_server", f"Created task with ID: {task_id}")
+
+                # Poll until the task finishes, giving up after 5 seconds
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + 5.0
+                while loop.time() < deadline:
+                    poll_response = await client.get(f"/tasks/{task_id}")
+                    if poll_response.json().get("status") in ("completed", "failed"):
+                        break
+                    await asyncio.sleep(0.05)
+
+                # Test task status retrieval and task listing together
+                status_response, list_response = await asyncio.gather(
+                    client.get(f"/tasks/{task_id}"), client.get("/tasks")
+                )
+                _note("fastapi_server", f"Task status retrieval: {status_response.status_code}")
 
                 if status_response.status_code == 200:
                     status_data = status_response.json()
-                    print(f"Task status: {status_data.get('status')}")
+                    _note("fastapi_server", f"Task status: {status_data.get('status')}")
 
-                # Test task listing
-                list_response = await client.get("/tasks")
-                print(f"Task listing status: {list_response.status_code}")
+                _note("fastapi_server", f"Task listing status: {list_response.status_code}")
 
                 return True
             else:
-                print(f"Task creation failed: {task_response.text}")
+                _note("fastapi_server", f"Task creation failed: {task_response.text}")
                 return False
 
     except Exception as e:
-        print(f"FastAPI server test failed (server may not be running): {e}")
+        _note("fastapi_server", f"FastAPI server test failed (server may not be running): {e}")
         return False
 
 
 async def test_error_handling():
     """Test error handling and validation"""
-    print("\nTesting error handling...")
+    _note("error_handling", "Testing error handling...")
 
     # Test empty task validation
     try:
         await run_agent_workflow("", max_iterations=1)
-        print("❌ Empty task validation failed")
+        _note("error_handling", "❌ Empty task validation failed")
         return False
     except Exception as e:
-        print(f"✅ Empty task properly rejected: {type(e).__name__}")
+        _note("error_handling", f"✅ Empty task properly rejected: {type(e).__name__}")
 
     # Test invalid max_iterations
     try:
         await run_agent_workflow("test task", max_iterations=0)
-        print("❌ Invalid max_iterations validation failed")
+        _note("error_handling", "❌ Invalid max_iterations validation failed")
         return False
     except Exception as e:
-        print(f"✅ Invalid max_iterations properly rejected: {type(e).__name__}")
+        _note("error_handling", f"✅ Invalid max_iterations properly rejected: {type(e).__name__}")
 
     # Test invalid max_iterations (too high)
     try:
         await run_agent_workflow("test task", max_iterations=25)
-        print("❌ Too high max_iterations validation failed")
+        _note("error_handling", "❌ Too high max_iterations validation failed")
         return False
     except Exception as e:
-        print(f"✅ Too high max_iterations properly rejected: {type(e).__name__}")
+        _note("error_handling", f"✅ Too high max_iterations properly rejected: {type(e).__name__}")
 
     return True
 
 
 async def main():
     """Run all integration tests"""
-    print("Running comprehensive BrowserFreak integration tests...")
-    print("=" * 60)
-
-    results = {}
-
-    # Test mock mode
-    results["mock_mode"] = await test_mock_mode()
-
-    # Test real browser mode (will fail if Playwright not installed)
-    results["real_browser"] = await test_real_browser_mode()
-
-    # Test health check
-    results["health_check"] = await test_health_check()
+    lines = ["Running comprehensive BrowserFreak integration tests...", "=" * 60]
+
+    # The stages are independent, so run them concurrently. Real browser mode fails if
+    # Playwright is not installed and the FastAPI test fails if the server is not running.
+    stages = {
+        "mock_mode": test_mock_mode(),
+        "real_browser": test_real_browser_mode(),
+        "health_check": test_health_check(),
+        "fastapi_server": test_fastapi_server(),
+        "error_handling": test_error_handling(),
+    }
+    outcomes = await asyncio.gather(*stages.values(), return_exceptions=True)
 
-    # Test FastAPI server (will fail if server not running)
-    results["fastapi_server"] = await test_fastapi_server()
+    # A stage that raised counts as failed
+    results = {
+        name: None if isinstance(outcome, BaseException) else outcome
+        for name, outcome in zip(stages, outcomes)
+    }
 
-    # Test error handling
-    results["error_handling"] = await test_error_handling()
+    # Group each stage's messages together, in stage order
+    for stage in stages:
+        lines.append("")
+        lines.extend(message for name, message in _notes if name == stage)
 
-    print("\n" + "=" * 60)
-    print("Integration test summary:")
-    print(f"Mock mode: {'PASSED' if results['mock_mode'] else 'FAILED'}")
-    print(
+    lines.append("\n" + "=" * 60)
+    lines.append("Integration test summary:")
+    lines.append(f"Mock mode: {'PASSED' if results['mock_mode'] else 'FAILED'}")
+    lines.append(
         f"Real browser mode: {'PASSED' if results['real_browser'] else 'FAILED (expected if Playwright not installed)'}"
     )
-    print(f"Health check: {'PASSED' if results['health_check'] else 'FAILED'}")
-    print(
+    lines.append(f"Health check: {'PASSED' if results['health_check'] else 'FAILED'}")
+    lines.append(
         f"FastAPI server: {'PASSED' if results['fastapi_server'] else 'FAILED (expected if server not running)'}"
     )
-    print(f"Error handling: {'PASSED' if results['error_handling'] else 'FAILED'}")
+    lines.append(f"Error handling: {'PASSED' if results['error_handling'] else 'FAILED'}")
 
     # Overall assessment
     core_tests_passed = (
@@ -172,20 +202,31 @@ async def main():
     optional_tests_passed = results["real_browser"] and results["fastapi_server"]
 
     if core_tests_passed:
-        print("\n✅ Core functionality tests PASSED!")
-        print("   - Browser agent works correctly")
-        print("   - Health checks are functional")
-        print("   - Error handling is robust")
+        lines.append("\n✅ Core functionality tests PASSED!")
+        lines.append("   - Browser agent works correctly")
+        lines.append("   - Health checks are functional")
+        lines.append("   - Error handling is robust")
 
         if optional_tests_passed:
-            print("✅ All tests PASSED! Full system integration successful.")
+            lines.append("✅ All tests PASSED! Full system integration successful.")
         elif results["real_browser"] or results["fastapi_server"]:
-            print("⚠️  Partial success: Some advanced features working")
+            lines.append("⚠️  Partial success: Some advanced features working")
         else:
-            print("ℹ️  Core functionality working, advanced features require setup")
+            lines.append("ℹ️  Core functionality working, advanced features require setup")
     else:
-        print("\n❌ Core functionality tests FAILED. Please check the implementation.")
+        lines.append("\n❌ Core functionality tests FAILED. Please check the implementation.")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        # uvloop is optional and unavailable on Windows
+        import uvloop
+
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = asyncio.new_event_loop
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())
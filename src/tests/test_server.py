@@ -0,0 +1,124 @@
+"""
+Tests for the FastAPI server's task queue and status index
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from browserfreak import server
+
+
+@pytest.fixture
+def runs(monkeypatch) -> List[str]:
+    """Give each test its own task state and record workflow runs instead of running them"""
+    started: List[str] = []
+
+    async def run_agent_workflow(task: str, **kwargs: Any) -> Dict[str, Any]:
+        started.append(task)
+        return {"task_complete": True}
+
+    monkeypatch.setattr(server, "run_agent_workflow", run_agent_workflow)
+    monkeypatch.setattr(server, "task_store", {})
+    monkeypatch.setattr(server, "task_index_by_status", defaultdict(dict))
+    monkeypatch.setattr(server, "task_queue", asyncio.Queue(maxsize=10))
+    return started
+
+
+async def _drain_queue() -> None:
+    """Run one worker until every queued task has been handled"""
+    worker = asyncio.create_task(server._worker(server.task_queue))
+    await server.task_queue.join()
+    worker.cancel()
+    await asyncio.gather(worker, return_exceptions=True)
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test")
+
+
+async def _task_ids(client: httpx.AsyncClient, status: str) -> List[str]:
+    response = await client.get("/tasks", params={"status": status})
+    return [task["task_id"] for task in response.json()["tasks"]]
+
+
+async def test_task_is_queued_until_a_worker_runs_it(runs):
+    async with _client() as client:
+        created = (
+            await client.post("/tasks", json={"task": "a", "use_real_browser": False})
+        ).json()
+        task_id = created["task_id"]
+
+        assert created["status"] == "queued"
+        assert await _task_ids(client, "queued") == [task_id]
+        assert await _task_ids(client, "running") == []
+
+        await _drain_queue()
+
+        assert runs == ["a"]
+        assert (await client.get(f"/tasks/{task_id}")).json()["status"] == "completed"
+        assert await _task_ids(client, "queued") == []
+        assert await _task_ids(client, "completed") == [task_id]
+
+
+async def test_task_cancelled_while_queued_is_never_run(runs):
+    async with _client() as client:
+        cancelled = (await client.post("/tasks", json={"task": "a"})).json()["task_id"]
+        kept = (await client.post("/tasks", json={"task": "b"})).json()["task_id"]
+        assert (await client.delete(f"/tasks/{cancelled}")).status_code == 200
+
+        await _drain_queue()
+
+        assert runs == ["b"]
+        assert (await client.get(f"/tasks/{cancelled}")).json()["status"] == "cancelled"
+        assert await _task_ids(client, "cancelled") == [cancelled]
+        assert await _task_ids(client, "completed") == [kept]
+
+
+async def test_task_cancelled_while_running_stays_cancelled(runs, monkeypatch):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def run_agent_workflow(task: str, **kwargs: Any) -> Dict[str, Any]:
+        started.set()
+        await release.wait()
+        return {"task_complete": True}
+
+    monkeypatch.setattr(server, "run_agent_workflow", run_agent_workflow)
+
+    async with _client() as client:
+        task_id = (await client.post("/tasks", json={"task": "a"})).json()["task_id"]
+        worker = asyncio.create_task(_drain_queue())
+        await started.wait()
+        assert (await client.get(f"/tasks/{task_id}")).json()["status"] == "running"
+
+        await client.delete(f"/tasks/{task_id}")
+        release.set()
+        await worker
+
+        task = (await client.get(f"/tasks/{task_id}")).json()
+        assert task["status"] == "cancelled"
+        assert task["result"] is None
+
+
+async def test_status_index_pages_and_moves_tasks(runs):
+    async with _client() as client:
+        task_ids = [
+            (await client.post("/tasks", json={"task": str(index)})).json()["task_id"]
+            for index in range(4)
+        ]
+        await client.delete(f"/tasks/{task_ids[1]}")
+
+        page = (
+            await client.get("/tasks", params={"status": "queued", "limit": 2, "offset": 1})
+        ).json()
+        assert page["total"] == 3
+        assert [task["task_id"] for task in page["tasks"]] == task_ids[2:]
+
+        # Each task sits in exactly one status bucket
+        assert await _task_ids(client, "cancelled") == [task_ids[1]]
+        assert sum(len(ids) for ids in server.task_index_by_status.values()) == 4
+        assert (await client.get("/tasks", params={"status": "unknown"})).json()["total"] == 0
@@ -0,0 +1,157 @@
+"""
+Tests for grouping and cancelling tool calls in execute_tools
+"""
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from browserfreak import tools
+
+
+@pytest.fixture
+def events(monkeypatch) -> List[Tuple[str, str]]:
+    """Replace every tool with one that records when each call starts and ends"""
+    recorded: List[Tuple[str, str]] = []
+
+    def fake(tool_name: str):
+        async def run(context: Any, **kwargs: Any) -> bool:
+            target = (
+                kwargs.get("selector")
+                or kwargs.get("element_selector")
+                or kwargs.get("website_name", "")
+            )
+            label = f"{tool_name}({target})"
+            recorded.append(("start", label))
+            await asyncio.sleep(0.01)
+            recorded.append(("end", label))
+            return True
+
+        return run
+
+    for tool_name in list(tools._DISPATCH):
+        monkeypatch.setitem(tools._DISPATCH, tool_name, fake(tool_name))
+    return recorded
+
+
+async def test_fill_then_submit_runs_one_call_at_a_time(events):
+    results = await tools.execute_tools(
+        [
+            ("type_text", {"selector": "#email", "text": "a@b.c"}),
+            ("type_text", {"selector": "#pw", "text": "secret"}),
+            ("click_element", {"selector": "#submit"}),
+        ]
+    )
+
+    assert results == [True, True, True]
+    # Fills share the page's focus, so neither overlaps the other or the click
+    assert events == [
+        ("start", "type_text(#email)"),
+        ("end", "type_text(#email)"),
+        ("start", "type_text(#pw)"),
+        ("end", "type_text(#pw)"),
+        ("start", "click_element(#submit)"),
+        ("end", "click_element(#submit)"),
+    ]
+
+
+async def test_scrolls_of_different_elements_run_together(events):
+    await tools.execute_tools(
+        [
+            ("scroll_page", {"direction": "down", "element_selector": "#list"}),
+            ("scroll_page", {"direction": "down", "element_selector": "#feed"}),
+        ]
+    )
+
+    assert [kind for kind, _ in events] == ["start", "start", "end", "end"]
+
+
+async def test_click_runs_alone_before_later_calls(events):
+    await tools.execute_tools(
+        [
+            ("click_element", {"selector": "#open"}),
+            ("type_text", {"selector": "#name", "text": "x"}),
+        ]
+    )
+
+    assert events == [
+        ("start", "click_element(#open)"),
+        ("end", "click_element(#open)"),
+        ("start", "type_text(#name)"),
+        ("end", "type_text(#name)"),
+    ]
+
+
+async def test_navigation_and_repeated_selector_are_barriers(events):
+    await tools.execute_tools(
+        [
+            ("type_text", {"selector": "#q", "text": "a"}),
+            ("type_text", {"selector": "#q", "text": "b"}),
+            ("navigate_to_website", {"website_name": "example"}),
+            ("scroll_page", {"direction": "down"}),
+        ]
+    )
+
+    assert [label for kind, label in events if kind == "start"] == [
+        "type_text(#q)",
+        "type_text(#q)",
+        "navigate_to_website(example)",
+        "scroll_page()",
+    ]
+    # No call overlaps another
+    assert all(kind == ("start" if i % 2 == 0 else "end") for i, (kind, _) in enumerate(events))
+
+
+async def test_unknown_tool_fails_without_running(events):
+    assert await tools.execute_tools([("drop_database", {})]) == [False]
+    assert events == []
+
+
+def _scrolling_tool(monkeypatch, outcomes: Dict[str, Any]) -> List[str]:
+    """Make scroll_page sleep briefly, then return or raise the outcome set for its element"""
+    finished: List[str] = []
+
+    async def scroll_page(context: Any, direction: str, element_selector: str, **_: Any) -> Any:
+        await asyncio.sleep(0.05 if outcomes[element_selector] is True else 0)
+        if isinstance(outcomes[element_selector], Exception):
+            raise outcomes[element_selector]
+        finished.append(element_selector)
+        return outcomes[element_selector]
+
+    monkeypatch.setitem(
+        tools._DISPATCH, "scroll_page", tools._safe_tool(default=False)(scroll_page)
+    )
+    return finished
+
+
+def _scrolls(*selectors: str) -> List[Tuple[str, Dict[str, Any]]]:
+    return [
+        ("scroll_page", {"direction": "down", "element_selector": selector})
+        for selector in selectors
+    ]
+
+
+async def test_falsy_result_does_not_cancel_siblings(monkeypatch):
+    # A scroll that is already at the end reports False without failing
+    finished = _scrolling_tool(monkeypatch, {"#a": False, "#b": True})
+
+    results = await tools.execute_tools(_scrolls("#a", "#b"))
+
+    assert results == [False, True]
+    assert finished == ["#a", "#b"]
+
+
+async def test_raising_tool_cancels_siblings(monkeypatch):
+    finished = _scrolling_tool(monkeypatch, {"#a": RuntimeError("detached"), "#b": True})
+
+    results = await tools.execute_tools(_scrolls("#a", "#b"))
+
+    assert results == [False, False]
+    assert finished == []
+
+
+async def test_raising_tool_outside_a_group_returns_its_default(monkeypatch):
+    _scrolling_tool(monkeypatch, {"#a": RuntimeError("detached")})
+
+    assert await tools.execute_tools(_scrolls("#a")) == [False]